@@ -10,7 +10,11 @@ https://github.com/Avaiga/taipy-course-gui
 
 from taipy.gui import Gui
 import taipy.gui.builder as tgb
-from math import cos, exp
+import pandas as pd
+from taipy.gui.data.decimator import LTTB
+
+from taipy_course.decay import decay_curve, positions
+from taipy_course.metrics import instrumented
 
 
 # +------------+
@@ -18,14 +22,21 @@ from math import cos, exp
 # +------------+
 
 value = 10
+n_points = 10_000  # Samples of x in 0..100, vectorized so millions are fine
+# Sends at most 2,000 points, the visible ones again when zooming in
+decimator = LTTB(n_out=2_000)
 
 
-# Cosine decay function
-def compute_data(decay: int) -> list:
-    return [cos(i/6) * exp((-i*decay) / 600) for i in range(100)]
+# Cosine decay function, memoized per decay value
+def compute_data(decay: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'x': positions(n_points),
+        'y': decay_curve(decay, n_points),
+    })
 
 
 # Define update fxn for when GUI slider is moved
+@instrumented
 def slider_moved(state):
     state.data = compute_data(state.value)
 
@@ -35,7 +46,7 @@ with tgb.Page() as page:
     tgb.text(value='# Taipy Getting Started', mode='md')
     tgb.text(value='**Value:** {value}', mode='md')
     tgb.slider(value='{value}', on_change=slider_moved)
-    tgb.chart(data='{data}')
+    tgb.chart(data='{data}', x='x', y='y', decimator='decimator')
 
 data = compute_data(value)
 
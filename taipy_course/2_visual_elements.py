@@ -12,6 +12,9 @@ from taipy.gui import Gui
 import taipy.gui.builder as tgb
 import pandas as pd
 
+from taipy_course.cube import top_states
+from taipy_course.registry import get_dataset
+
 
 # +------------+
 # | Build Page |
@@ -39,13 +42,10 @@ import pandas as pd
 #         'title': f'Sales by State for {state.selected_category}',
 #     }
 
-data = pd.read_csv('taipy_course/data.csv')
+data = get_dataset('orders')  # Shared, read-only view
 chart_data = (
-    data
-    .groupby(by='State')['Sales']  # Group sales by state
-    .sum()  # Total sales by state
-    .sort_values(ascending=False)  # In descending order
-    .head(10)  # Top-10 states
+    get_dataset('top_states')  # Sales by state, kept up to date
+    .top(10)  # Top-10 states, w/o sorting them all
     .reset_index()  # Make state names a column instead of index
 )
 
@@ -60,12 +60,8 @@ layout = {
 
 def change_category(state):
     state.data = data[data['Category'] == state.selected_category]
-    state.chart_data = (
-        state.data.groupby('State')['Sales']
-        .sum()
-        .sort_values(ascending=False)
-        .head(10)
-        .reset_index()
+    state.chart_data = top_states(
+        state.data.groupby('State', observed=True)['Sales'].sum()
     )
     state.layout = {
         'yaxis': {'title': 'Revenue (USD)'},
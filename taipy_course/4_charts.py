@@ -10,94 +10,49 @@ https://github.com/Avaiga/taipy-course-gui
 
 from taipy.gui import Gui
 import taipy.gui.builder as tgb
-import pandas as pd
 
-from taipy_course.chart import generate_map
+from taipy_course.dashboard import (  # Bound by name in the page
+    add_view,
+    applied_filters,
+    apply_changes,
+    categories,
+    change_category,
+    chart_data,
+    end_date,
+    layout,
+    on_init,
+    refresh_changes,
+    selected_category,
+    selected_subcategory,
+    start_date,
+    subcategories,
+)
+from taipy_course.ingest import follow_orders
+from taipy_course.push import SERVER_CONFIG
+from taipy_course.queries import sales_map
+from taipy_course.table import (  # Bound by name in table_controls()
+    change_table_view,
+    next_table_page,
+    previous_table_page,
+    table_controls,
+    table_data,
+    table_filter_column,
+    table_filter_value,
+    table_order,
+    table_page,
+    table_page_count,
+    table_sort,
+    table_summary,
+)
 
 
 # +---------+
 # | Backend |
 # +---------+
 
-data = pd.read_csv('taipy_course/data.csv')
-chart_data = (
-    data
-    .groupby(by='State')['Sales']  # Group sales by state
-    .sum()  # Total sales by state
-    .sort_values(ascending=False)  # In descending order
-    .head(10)  # Top-10 states
-    .reset_index()  # Make state names a column instead of index
-)
-
-categories = data['Category'].unique().tolist()
-selected_category = 'Furniture'
-
-selected_subcategory = 'Bookcases'
-subcategories = (
-    data.loc[data['Category'] == selected_category, 'Sub-Category']
-    .unique()
-    .tolist()
-)
-
-layout = {
-    'yaxis': {'title': 'Revenue (USD)'},
-    'title': 'Sales by State'
-}
-
-start_date = pd.to_datetime('2015-01-01')
-end_date = pd.to_datetime('2018-12-31')
-
-map_fig = generate_map(data)
-
-
-def change_category(state):
-    state.subcategories = (
-        data.loc[data['Category'] == state.selected_category, 'Sub-Category']
-        .unique()
-        .tolist()
-    )
-    state.selected_subcategory = state.subcategories[0]  # Auto-select a sub-cat
-
-
-def apply_changes(state):
-    # Filter by order dates w/i start & end date
-    state.data = data[
-        (
-            pd.to_datetime(data['Order Date'], format='%d/%m/%Y')
-            >= pd.to_datetime(start_date, format='%Y-%m-%d')
-        )
-        & (
-            pd.to_datetime(data['Order Date'], format='%d/%m/%Y')
-            <= pd.to_datetime(end_date, format='%Y-%m-%d')
-        )
-    ]
-
-    # Filter by category
-    state.data = data[data['Category'] == state.selected_category]
-
-    # Filter by sub-category
-    state.data = (
-        state.data[state.data['Sub-Category'] == state.selected_subcategory]
-    )
-
-    # Generate state-wise sales chart data from order data
-    state.chart_data = (
-        state.data.groupby('State')['Sales']
-        .sum()
-        .sort_values(ascending=False)
-        .head(10)
-        .reset_index()
-    )
-
-    # Bar chart layout
-    state.layout = {
-        'yaxis': {'title': 'Revenue (USD)'},
-        'title': (f'Sales by State for {state.selected_category} '
-                  f'- {state.selected_subcategory}'),
-    }
-
-    # Regenerate map based on filtered data
-    state.map_fig = generate_map(state.data)
+# Filters, Apply & the top-10 chart are dashboard.py's, w/ the map too
+map_fig = None  # See on_init()
+add_view('map_fig', lambda state: sales_map)
 
 
 # +------------+
@@ -127,7 +82,8 @@ with tgb.Page() as page:
                     tgb.text('Product **Category**', mode='md')
                     tgb.selector(
                         value='{selected_category}',
-                        lov=categories,  # Static list to show all categories
+                        lov='{categories}',  # Updated w/ appended orders
+                        value_by_id=True,  # Bind the value, not the label
                         dropdown=True,  # Dropdown list
                         on_change=change_category
                     )
@@ -136,6 +92,7 @@ with tgb.Page() as page:
                     tgb.selector(
                         value='{selected_subcategory}',
                         lov='{subcategories}',  # Dynamic list of sub-cats
+                        value_by_id=True,  # Bind the value, not the label
                         dropdown=True,  # Dropdown list
                     )
 
@@ -176,8 +133,8 @@ with tgb.Page() as page:
 
         tgb.html('br')  # Break for vertical spacing
 
-        # Table of source data by selected category
-        tgb.table(data='{data}')
+        # Sorting, filtering & paging controls, then the table
+        table_controls()
 
 
 # +------+
@@ -190,9 +147,17 @@ def main():
 
 if __name__ == '__main__':
     # Will not work if encapsulated in main()
-    Gui(page=page).run(
+    gui = Gui(page=page)
+
+    # Pick up orders appended to data.csv while the app is running (via
+    # the server's republished copy when a taipy_course.serve worker)
+    follow_orders(gui, refresh=refresh_changes)
+
+    gui.run(
         title='Sales',
         # dark_mode=False
         port='auto',  # choose any free port
+        use_arrow=True,  # Table pages sent as binary Arrow, not JSON
+        server_config=SERVER_CONFIG,  # Compressed payloads, see push.py
         use_reloader=True  # safe for notebooks
     )
\ No newline at end of file
@@ -8,98 +8,105 @@ https://github.com/Avaiga/taipy-course-gui
 # | Imports |
 # +---------+
 
+from functools import partial
+
 from taipy.gui import Gui, Icon, navigate
 import taipy.gui.builder as tgb
 import pandas as pd
-
-from taipy_course.chart import generate_map
+from taipy.gui.data.decimator import MinMaxDecimator
+
+from taipy_course.dashboard import (  # Bound by name in the pages
+    add_view,
+    applied_filters,
+    apply_changes,
+    categories,
+    change_category,
+    chart_data,
+    end_date,
+    layout,
+    on_init,
+    refresh_changes,
+    selected_category,
+    selected_subcategory,
+    start_date,
+    subcategories,
+)
+from taipy_course.ingest import follow_orders
+from taipy_course.metrics import instrumented
+from taipy_course.push import SERVER_CONFIG, push
+from taipy_course.queries import sales_map, sales_trend
+from taipy_course.table import (  # Bound by name in table_controls()
+    change_table_view,
+    next_table_page,
+    previous_table_page,
+    table_controls,
+    table_data,
+    table_filter_column,
+    table_filter_value,
+    table_order,
+    table_page,
+    table_page_count,
+    table_sort,
+    table_summary,
+)
 
 
 # +---------+
 # | Backend |
 # +---------+
 
-data = pd.read_csv('taipy_course/data.csv')
-chart_data = (
-    data
-    .groupby(by='State')['Sales']  # Group sales by state
-    .sum()  # Total sales by state
-    .sort_values(ascending=False)  # In descending order
-    .head(10)  # Top-10 states
-    .reset_index()  # Make state names a column instead of index
-)
-
-categories = data['Category'].unique().tolist()
-selected_category = 'Furniture'
-
-selected_subcategory = 'Bookcases'
-subcategories = (
-    data.loc[data['Category'] == selected_category, 'Sub-Category']
-    .unique()
-    .tolist()
-)
-
-layout = {
+# Filters, Apply & the top-10 chart are dashboard.py's, w/ the map &
+# trend added below
+map_fig = None  # Built when a session 1st opens page 1, see on_navigate()
+
+# Daily or weekly sales from the per-day prefix sums, on page 3
+TREND_FREQS = {'Daily': 'D', 'Weekly': 'W'}
+trend_freq = 'Weekly'
+trend_data = pd.DataFrame({'Date': pd.to_datetime([]), 'Sales': []})
+# Keeps the peak days. Only past 1,000 days: MinMaxDecimator shows no
+# point at all for a series shorter than n_out / 2
+trend_decimator = MinMaxDecimator(n_out=2_000, threshold=1_000)
+trend_layout = {
     'yaxis': {'title': 'Revenue (USD)'},
-    'title': 'Sales by State'
+    'title': 'Sales over Time'
 }
 
-start_date = pd.to_datetime('2015-01-01')
-end_date = pd.to_datetime('2018-12-31')
-
-map_fig = generate_map(data)
 
+def map_query(state):
+    # Until built, on_navigate() builds it for the applied filters
+    return sales_map if state.map_fig is not None else None
 
-def change_category(state):
-    state.subcategories = (
-        data.loc[data['Category'] == state.selected_category, 'Sub-Category']
-        .unique()
-        .tolist()
-    )
-    state.selected_subcategory = state.subcategories[0]  # Auto-select a sub-cat
 
+def trend_query(state):
+    # At the frequency toggled in the session
+    return partial(sales_trend, freq=TREND_FREQS[state.trend_freq])
 
-def apply_changes(state):
-    # Filter by order dates w/i start & end date
-    state.data = data[
-        (
-            pd.to_datetime(data['Order Date'], format='%d/%m/%Y')
-            >= pd.to_datetime(start_date, format='%Y-%m-%d')
-        )
-        & (
-            pd.to_datetime(data['Order Date'], format='%d/%m/%Y')
-            <= pd.to_datetime(end_date, format='%Y-%m-%d')
-        )
-    ]
 
-    # Filter by category
-    state.data = data[data['Category'] == state.selected_category]
+add_view('map_fig', map_query)
+add_view(
+    'trend_data', trend_query, layout='trend_layout', title='Sales over Time'
+)
 
-    # Filter by sub-category
-    state.data = (
-        state.data[state.data['Sub-Category'] == state.selected_subcategory]
-    )
 
-    # Generate state-wise sales chart data from order data
-    state.chart_data = (
-        state.data.groupby('State')['Sales']
-        .sum()
-        .sort_values(ascending=False)
-        .head(10)
-        .reset_index()
+@instrumented
+def change_trend_freq(state):
+    # Any date range is 2 lookups per cell in the prefix sums, no thread
+    push(
+        state,
+        trend_data=sales_trend(
+            *state.applied_filters, freq=TREND_FREQS[state.trend_freq]
+        ),
     )
 
-    # Bar chart layout
-    state.layout = {
-        'yaxis': {'title': 'Revenue (USD)'},
-        'title': (f'Sales by State for {state.selected_category} '
-                  f'- {state.selected_subcategory}'),
-    }
 
-    # Regenerate map based on filtered data
-    state.map_fig = generate_map(state.data)
+def on_navigate(state, page_name):
+    # Deferred from startup, so the Gui serves before Plotly is loaded
+    if page_name == 'page1' and state.map_fig is None:
+        push(state, map_fig=sales_map(*state.applied_filters))
+    return page_name
 
 
+@instrumented
 def change_page(state, id, payload):
     page_name = payload['args'][0]  # Payload is a dict
     navigate(state=state, to=page_name)
@@ -117,6 +124,7 @@ with tgb.Page() as root_page:
         # List of tuples: ('page_url', Icon(path_to_icon.png, 'Page Name'))
         lov=[
             ('page1', Icon('images/map.png', 'Sales')),
+            ('page3', Icon('images/trend.png', 'Trend')),
             ('page2',
              Icon('images/person.png', 'Account')),
         ],
@@ -146,7 +154,8 @@ with tgb.Page() as page_1:
                     tgb.text('Product **Category**', mode='md')
                     tgb.selector(
                         value='{selected_category}',
-                        lov=categories,  # Static list to show all categories
+                        lov='{categories}',  # Updated w/ appended orders
+                        value_by_id=True,  # Bind the value, not the label
                         dropdown=True,  # Dropdown list
                         on_change=change_category
                     )
@@ -155,6 +164,7 @@ with tgb.Page() as page_1:
                     tgb.selector(
                         value='{selected_subcategory}',
                         lov='{subcategories}',  # Dynamic list of sub-cats
+                        value_by_id=True,  # Bind the value, not the label
                         dropdown=True,  # Dropdown list
                     )
 
@@ -195,8 +205,31 @@ with tgb.Page() as page_1:
 
         tgb.html('br')  # Break for vertical spacing
 
-        # Table of source data by selected category
-        tgb.table(data='{data}')
+        # Sorting, filtering & paging controls, then the table
+        table_controls()
+
+with tgb.Page() as page_3:
+    with tgb.part(class_name='container'):
+        tgb.text('# Sales over **Time**', mode='md')
+        tgb.text(
+            'For the dates & categories applied on the Sales page', mode='md'
+        )
+
+        tgb.toggle(
+            value='{trend_freq}',
+            lov=list(TREND_FREQS),
+            on_change=change_trend_freq
+        )
+
+        # Line chart of sales per day/week, downsampled to the chart width
+        tgb.chart(
+            data='{trend_data}',
+            x='Date',
+            y='Sales',
+            mode='lines',
+            decimator='trend_decimator',
+            layout='{trend_layout}'
+        )
 
 with tgb.Page() as page_2:
     tgb.text('# Account **Management**', mode='md')
@@ -220,12 +253,20 @@ if __name__ == '__main__':
         '/': root_page,
         'page1': page_1,
         'page2': page_2,
+        'page3': page_3,
     }
 
     app = (Gui(pages=pages))
+
+    # Pick up orders appended to data.csv while the app is running (via
+    # the server's republished copy when a taipy_course.serve worker)
+    follow_orders(app, refresh=refresh_changes)
+
     app.run(
         title='Sales',
         # dark_mode=False
         port='auto',  # choose any free port
+        use_arrow=True,  # Table pages sent as binary Arrow, not JSON
+        server_config=SERVER_CONFIG,  # Compressed payloads, see push.py
         use_reloader=True  # safe for notebooks
     )
\ No newline at end of file
@@ -0,0 +1,259 @@
+'''
+Headless benchmarks for the taipy_course dashboard callbacks.
+
+Drives slider_moved, change_category, apply_changes and generate_map
+with a stand-in state object on synthetic order tables of growing size,
+outside of the Gui, and reports p50/p95/p99 latency and peak memory:
+
+    python -m taipy_course.benchmark --sizes 10000 100000 1000000
+    python -m taipy_course.benchmark --save baseline.json
+    python -m taipy_course.benchmark --compare baseline.json
+
+With --compare, the exit status is 1 if any p95 latency got slower than
+--threshold times its baseline.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import argparse
+import importlib
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from taipy_course import queries
+from taipy_course.engines import ENGINES
+from taipy_course.generator import generate_orders
+from taipy_course.loader import OrderColumns
+from taipy_course.queries import results, state_sales
+from taipy_course.registry import registry
+
+
+# +----------------+
+# | Synthetic Data |
+# +----------------+
+
+def synthetic_orders(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    '''n_rows orders from the synthetic generator, in one table.'''
+    return pd.concat(generate_orders(n_rows, seed), ignore_index=True)
+
+
+def stand_in_state(module: types.ModuleType) -> types.SimpleNamespace:
+    '''Plain object with a page module's variables, in place of State.'''
+    return types.SimpleNamespace(**{
+        name: value
+        for name, value in vars(module).items()
+        if not name.startswith('_')
+        and not callable(value)
+        and not isinstance(value, types.ModuleType)
+    })
+
+
+# +---------+
+# | Timings |
+# +---------+
+
+def measure(
+        call: t.Callable[[], None], repeat: int, cold: bool
+) -> dict[str, float]:
+    '''Latency percentiles (ms) over repeat calls, and peak MiB of one.'''
+    latencies = []
+    for _ in range(repeat):
+        if cold:
+            results.clear()  # Measure the queries, not cache lookups
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Traced separately, tracemalloc slows down the timed calls
+    if cold:
+        results.clear()
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {'p50': p50, 'p95': p95, 'p99': p99, 'peak_mib': peak / 2**20}
+
+
+def fresh_import(name: str) -> types.ModuleType:
+    '''Import a module, re-running it if it was already imported.'''
+    if name in sys.modules:
+        return importlib.reload(sys.modules[name])
+    return importlib.import_module(name)
+
+
+def benchmark(
+        n_rows: int,
+        repeat: int,
+        cold: bool,
+        engine: str = 'pandas',
+        seed: int = 0,
+) -> dict[str, dict[str, float]]:
+    '''Time every dashboard callback on an n_rows order table.'''
+    data = synthetic_orders(n_rows, seed)
+    engine_before = queries.engine
+    with (
+        # Files for the Polars & streaming engines, removed afterwards
+        tempfile.TemporaryDirectory() as directory,
+        # Every dataset derived from the synthetic orders, only in here
+        registry.overridden(order_columns=lambda: OrderColumns(data)),
+    ):
+        try:
+            return _benchmark(data, repeat, cold, engine, seed, directory)
+        finally:
+            queries.engine = engine_before
+
+
+def _benchmark(
+        data: pd.DataFrame,
+        repeat: int,
+        cold: bool,
+        engine: str,
+        seed: int,
+        directory: str,
+) -> dict[str, dict[str, float]]:
+    '''benchmark() once data is registered, w/ directory for files.'''
+    # The Polars & streaming engines read files, so give them the table too
+    if engine in ('polars', 'streaming'):
+        source = Path(directory) / 'orders.parquet'
+        data.to_parquet(source, index=False)
+        queries.engine = ENGINES[engine](source)
+    else:
+        queries.set_engine(engine)
+
+    # (Re)import the pages so their module-level data is the synthetic one
+    getting_started = fresh_import('taipy_course.1_getting_started')
+    charts = fresh_import('taipy_course.4_charts')
+    chart = fresh_import('taipy_course.chart')
+    state = stand_in_state(charts)
+    slider = stand_in_state(getting_started)
+
+    # Filters picked at random (but repeatably) from the data itself
+    rng = np.random.default_rng(seed)
+    pairs = (
+        data[['Category', 'Sub-Category']]
+        .drop_duplicates()
+        .astype(str)
+        .to_numpy()
+    )
+    dates = data['Order Date']
+
+    def pick_filters():
+        state.selected_category, state.selected_subcategory = (
+            pairs[rng.integers(len(pairs))]
+        )
+        start = dates.min() + pd.Timedelta(days=int(rng.integers(0, 730)))
+        state.start_date = start
+        state.end_date = start + pd.Timedelta(days=int(rng.integers(1, 730)))
+
+    def slider_moved():
+        slider.value = int(rng.integers(0, 101))
+        getting_started.slider_moved(slider)
+
+    def change_category():
+        pick_filters()
+        charts.change_category(state)
+
+    def apply_changes():
+        pick_filters()
+        charts.apply_changes(state)
+
+    def generate_map():
+        pick_filters()
+        chart.generate_map(
+            state_sales(
+                state.start_date,
+                state.end_date,
+                state.selected_category,
+                state.selected_subcategory,
+            )
+        )
+
+    return {
+        name: measure(call, repeat, cold)
+        for name, call in [
+            ('slider_moved', slider_moved),
+            ('change_category', change_category),
+            ('apply_changes', apply_changes),
+            ('generate_map', generate_map),
+        ]
+    }
+
+
+# +------+
+# | Main |
+# +------+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+        help='order table sizes to run, e.g. up to 10000000',
+    )
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='pandas')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--warm', action='store_true',
+        help='keep the shared result cache between calls',
+    )
+    parser.add_argument('--save', help='write the results to a JSON file')
+    parser.add_argument('--compare', help='baseline JSON from --save')
+    parser.add_argument(
+        '--threshold', type=float, default=1.2,
+        help='allowed p95 slowdown vs the baseline, as a ratio',
+    )
+    args = parser.parse_args(argv)
+
+    report = {}
+    print(f"{'rows':>10} {'callback':<16} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'peak MiB':>9}")
+    for n_rows in args.sizes:
+        timings = benchmark(
+            n_rows, args.repeat, not args.warm, args.engine, args.seed
+        )
+        report[str(n_rows)] = timings
+        for name, stats in timings.items():
+            print(f"{n_rows:>10} {name:<16} {stats['p50']:>9.2f} "
+                  f"{stats['p95']:>9.2f} {stats['p99']:>9.2f} "
+                  f"{stats['peak_mib']:>9.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    # Regression mode: flag any callback whose p95 got too much slower
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = [
+            f'{n_rows} rows, {name}: p95 {stats["p95"]:.2f} ms vs '
+            f'{baseline[n_rows][name]["p95"]:.2f} ms'
+            for n_rows, timings in report.items()
+            if n_rows in baseline
+            for name, stats in timings.items()
+            if name in baseline[n_rows]
+            and stats['p95'] > args.threshold * baseline[n_rows][name]['p95']
+        ]
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
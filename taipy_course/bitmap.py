@@ -0,0 +1,225 @@
+'''
+Bitmap indexes over the low-cardinality columns of the order table.
+
+Every distinct value of an indexed column gets a bitmap with one bit per
+order row, packed into 64-bit words. A composite dashboard filter is
+then a handful of word-wise ANDs (and ORs for value lists or date
+ranges) instead of one full string comparison per filter widget.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import copy
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+
+# +--------+
+# | Bitmap |
+# +--------+
+
+BITMAP_COLUMNS = [
+    'Category',
+    'Sub-Category',
+    'State',
+    'Region',
+    'Segment',
+    'Ship Mode',
+    'Order Month',  # Derived from 'Order Date', one bucket per month
+]
+
+
+def pack(mask: np.ndarray) -> np.ndarray:
+    '''Pack a boolean row mask into little-endian 64-bit words.'''
+    packed = np.packbits(mask, bitorder='little')
+    padding = -len(packed) % 8  # Whole words only
+    return np.pad(packed, (0, padding)).view(np.uint64)
+
+
+def reserve(buffer: np.ndarray, size: int) -> np.ndarray:
+    '''buffer if it holds size items, else a copy w/ twice the room.'''
+    if len(buffer) >= size:
+        return buffer
+    grown = np.zeros(max(size, 2 * len(buffer)), dtype=buffer.dtype)
+    grown[:len(buffer)] = buffer
+    return grown
+
+
+class BitmapIndex:
+    '''Per-value bitmaps of the BITMAP_COLUMNS of an order table.'''
+
+    def __init__(self, data: pd.DataFrame, columns=BITMAP_COLUMNS):
+        self.n_rows = len(data)
+        self.n_words = -(-self.n_rows // 64)
+
+        # Buffers w/ room for appended rows, see extended(): the bitmaps
+        # & dates used by queries are read-only views of their start
+        self._date_buffer = data['Order Date'].to_numpy()  # Partial months
+        self._buffers: dict[str, dict[t.Hashable, np.ndarray]] = {}
+        for column in columns:
+            codes, uniques = pd.factorize(
+                self._values(data, column), sort=True
+            )
+            self._buffers[column] = {
+                value: pack(codes == code)
+                for code, value in enumerate(uniques)
+            }
+        self._view()
+
+    @staticmethod
+    def _values(data: pd.DataFrame, column: str) -> pd.Series:
+        if column == 'Order Month':
+            return data['Order Date'].dt.to_period('M')
+        return data[column]
+
+    def _view(self):
+        '''Point the bitmaps & dates at the used part of the buffers.'''
+        self._dates = self._date_buffer[:self.n_rows]
+        self._dates.flags.writeable = False
+        self.bitmaps: dict[str, dict[t.Hashable, np.ndarray]] = {}
+        for column, buffers in self._buffers.items():
+            self.bitmaps[column] = {}
+            for value, buffer in buffers.items():
+                words = buffer[:self.n_words]
+                words.flags.writeable = False  # Shared, combine into copies
+                self.bitmaps[column][value] = words
+
+    def extended(self, rows: pd.DataFrame) -> 'BitmapIndex':
+        '''
+        New index with appended order rows, written in place.
+
+        Buffers double when full, and otherwise only the last word of
+        the old rows & the new words get bits ORed in, so k rows cost
+        O(k) amortised. Indexes from before only read their own rows.
+        '''
+        extended = copy.copy(self)
+        extended.n_rows = self.n_rows + len(rows)
+        extended.n_words = -(-extended.n_rows // 64)
+
+        extended._date_buffer = reserve(self._date_buffer, extended.n_rows)
+        extended._date_buffer[self.n_rows:extended.n_rows] = (
+            rows['Order Date'].to_numpy()
+        )
+
+        # Bit i of the new rows is bit n_rows + i of the combined map
+        positions = self.n_rows + np.arange(len(rows))
+        words, bits = positions // 64, np.uint64(1) << (
+            positions % 64
+        ).astype(np.uint64)
+
+        extended._buffers = {}
+        for column, buffers in self._buffers.items():
+            buffers = extended._buffers[column] = {
+                value: reserve(buffer, extended.n_words)
+                for value, buffer in buffers.items()
+            }
+            codes, uniques = pd.factorize(self._values(rows, column))
+            for code, value in enumerate(uniques):
+                if value not in buffers:  # New value, no bits set before
+                    buffers[value] = np.zeros(
+                        extended.n_words, dtype=np.uint64
+                    )
+                matches = codes == code
+                np.bitwise_or.at(
+                    buffers[value], words[matches], bits[matches]
+                )
+
+        extended._view()
+        return extended
+
+    @property
+    def nbytes(self) -> int:
+        return self._date_buffer.nbytes + sum(
+            buffer.nbytes
+            for buffers in self._buffers.values()
+            for buffer in buffers.values()
+        )
+
+    def all(self) -> np.ndarray:
+        '''Bitmap with every row set.'''
+        return pack(np.ones(self.n_rows, dtype=bool))
+
+    def none(self) -> np.ndarray:
+        '''Bitmap with no row set.'''
+        return np.zeros(self.n_words, dtype=np.uint64)
+
+    def bitmap(self, column: str, value) -> np.ndarray:
+        '''Rows where column == value (no rows for unseen values).'''
+        return self.bitmaps[column].get(value, self.none())
+
+    def any_of(self, column: str, values) -> np.ndarray:
+        '''Rows where column is any of values, by OR-ing bitmaps.'''
+        words = self.none()
+        for value in values:
+            words |= self.bitmap(column, value)
+        return words
+
+    def date_range(self, start_date=None, end_date=None) -> np.ndarray:
+        '''Rows with start_date <= Order Date <= end_date.'''
+        months = self.bitmaps['Order Month']
+        start = None if start_date is None else pd.Timestamp(start_date)
+        end = None if end_date is None else pd.Timestamp(end_date)
+
+        words = self.none()
+        for month, month_words in months.items():
+            if start is not None and month.end_time < start:
+                continue
+            if end is not None and month.start_time > end:
+                continue
+
+            # Whole months are ORed in directly, partial ones row by row
+            if (
+                (start is None or month.start_time >= start)
+                and (end is None or month.end_time.normalize() <= end)
+            ):
+                words |= month_words
+            else:
+                rows = self.rows(month_words)
+                dates = self._dates[rows]
+                keep = np.ones(len(rows), dtype=bool)
+                if start is not None:
+                    keep &= dates >= start.to_datetime64()
+                if end is not None:
+                    keep &= dates <= end.to_datetime64()
+                mask = np.zeros(self.n_rows, dtype=bool)
+                mask[rows[keep]] = True
+                words |= pack(mask)
+        return words
+
+    def select(self, start_date=None, end_date=None, **filters) -> np.ndarray:
+        '''
+        AND together a date range and column == value filters.
+
+        Columns with spaces or dashes are passed through a dict, e.g.
+        index.select(**{'Sub-Category': 'Phones'}).
+        '''
+        words = (
+            self.all() if start_date is None and end_date is None
+            else self.date_range(start_date, end_date)
+        )
+        for column, value in filters.items():
+            if value is not None:
+                words &= self.bitmap(column, value)
+        return words
+
+    def rows(self, words: np.ndarray) -> np.ndarray:
+        '''Positions of the rows set in a bitmap, in table order.'''
+        bits = np.unpackbits(
+            words.view(np.uint8), count=self.n_rows, bitorder='little'
+        )
+        return np.flatnonzero(bits)
+
+    def count(self, words: np.ndarray) -> int:
+        '''Number of rows set in a bitmap.'''
+        # Appends to a newer index may set bits past n_rows in the last
+        # word, which this index doesn't have, so those are masked out
+        full, partial = divmod(self.n_rows, 64)
+        count = int(np.bitwise_count(words[:full]).sum())
+        if partial:
+            last = words[full] & np.uint64((1 << partial) - 1)
+            count += int(np.bitwise_count(last))
+        return count
@@ -0,0 +1,156 @@
+'''
+Bounded LRU cache for dashboard query results.
+
+One cache is shared by every session in the process, so two users
+choosing the same filters only pay for the query once. Entries are
+evicted least-recently-used first once their estimated size goes over
+max_bytes.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import sys
+import threading
+import typing as t
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# +--------+
+# | Sizing |
+# +--------+
+
+def sizeof(value) -> int:
+    '''Rough deep size of a cached value in bytes.'''
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        # Strings counted like memory_usage(deep=True), which fails on
+        # the read-only object arrays of registry datasets
+        size = int(np.sum(value.memory_usage()))
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        for _, column in frame.items():
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.cat.categories
+            if column.dtype == object:
+                size += sum(map(sys.getsizeof, column))
+        return size
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sizeof(k) + sizeof(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if hasattr(value, 'to_plotly_json'):  # Plotly figures & traces
+        return sizeof(value.to_plotly_json())
+    return sys.getsizeof(value)
+
+
+# +-------+
+# | Cache |
+# +-------+
+
+class ResultCache:
+    '''Thread-safe LRU cache bounded by the total size of its entries.'''
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[t.Hashable, tuple[t.Any, int]] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.generation = 0  # Bumped by clear(), see put()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: t.Hashable, compute: t.Callable[[], t.Any]):
+        '''Cached value for key, calling compute() on a miss.'''
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            generation = self.generation
+
+        # Compute w/o holding the lock so other sessions aren't blocked
+        value = compute()
+        self.put(key, value, generation)
+        return value
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        '''Whether key is cached, w/o counting a hit or refreshing it.'''
+        with self._lock:
+            return key in self._entries
+
+    def put(
+            self, key: t.Hashable, value, generation: int | None = None
+    ):
+        '''
+        Store value under key, evicting old entries to make room.
+
+        A value computed while the cache was at an older generation is
+        dropped: a clear() in between means it may be from stale data.
+        '''
+        size = sizeof(value)
+        if size > self.max_bytes:
+            return  # Would evict everything else & still not fit
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def resize(self, key: t.Hashable):
+        '''
+        Measure key's value again after it grew in place, e.g. a table
+        adding a sort index, & evict old entries to make room.
+        '''
+        with self._lock:
+            if key not in self._entries:
+                return
+            value = self._entries[key][0]
+        size = sizeof(value)  # W/o the lock, like put()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not value:
+                return  # Evicted or replaced in the meantime
+            self._bytes += size - entry[1]
+            self._entries[key] = (value, size)
+            self._evict()
+
+    def _evict(self):
+        '''Drop least recently used entries until under max_bytes.'''
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        '''Drop every entry, e.g. when the underlying dataset reloads.'''
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.generation += 1
+
+    def stats(self) -> dict[str, int]:
+        '''Hit/miss/eviction counters and current occupancy.'''
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
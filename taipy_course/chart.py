@@ -1,7 +1,13 @@
+import base64
+import copy
+import json
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 
-data = pd.read_csv("taipy_course/data.csv")
+from taipy_course.registry import get_dataset
 
 state_codes = {
     "Alabama": "AL",
@@ -12,6 +18,7 @@ state_codes = {
     "Colorado": "CO",
     "Connecticut": "CT",
     "Delaware": "DE",
+    "District of Columbia": "DC",
     "Florida": "FL",
     "Georgia": "GA",
     "Hawaii": "HI",
@@ -57,36 +64,28 @@ state_codes = {
 }
 
 
-def generate_map(data: pd.DataFrame) -> go.Figure:
-    map_data = data.groupby("State")["Sales"].sum().reset_index()
-    map_data["text"] = (
-        map_data["State"] + "<br>" + "Sales: $" + map_data["Sales"].astype(str)
-    )
-    map_data["codes"] = map_data["State"].map(state_codes)
+# Per-call arrays of each trace, everything else comes from the template
+MAP_ARRAYS = [["locations", "z"], ["locations", "text", "hovertext"]]
 
-    fig = go.Figure(
-        data=go.Choropleth(
-            locations=map_data["codes"],
-            z=map_data["Sales"].astype(float),
-            locationmode="USA-states",
-            colorscale="Reds",
-            colorbar_title="Sales (USD)",
-            hoverinfo="none",
-        )
-    )
 
-    for i, row in map_data.iterrows():
-        fig.add_trace(
+def map_template() -> go.Figure:
+    # Colored states, plus every state label as a single text trace
+    fig = go.Figure(
+        data=[
+            go.Choropleth(
+                locationmode="USA-states",
+                colorscale="Reds",
+                colorbar_title="Sales (USD)",
+                hoverinfo="none",
+            ),
             go.Scattergeo(
                 locationmode="USA-states",
-                locations=[row["codes"]],
-                text=f"{row['codes']}",
-                hovertext=f"{row['State']}<br>${row['Sales']:,.2f}",
                 hoverinfo="text",
                 mode="text",
                 textfont=dict(size=7),
-            )
-        )
+            ),
+        ]
+    )
 
     fig.update_layout(
         title_text="Sales by State",
@@ -97,6 +96,96 @@ def generate_map(data: pd.DataFrame) -> go.Figure:
     return fig
 
 
+# Built & serialized once, with a placeholder string for each array
+MAP_TEMPLATE = map_template().to_plotly_json()
+MAP_JSON = pio.to_json(
+    {
+        "data": [
+            {**trace, **{key: f"@{key}" for key in keys}}
+            for trace, keys in zip(MAP_TEMPLATE["data"], MAP_ARRAYS)
+        ],
+        "layout": MAP_TEMPLATE["layout"],
+    },
+    validate=False,
+).split('"@')  # Text after each split starts with the array's key + '"'
+
+
+def same(a, b) -> bool:
+    """Deep equality of figure dicts, lists & arrays."""
+    if a is b:
+        return True
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(same(a[key], b[key]) for key in a)
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(map(same, a, b))
+    return a == b
+
+
+class MapFigure(go.Figure):
+    """Map figure that serializes by splicing into MAP_JSON, until changed."""
+
+    def to_json(self, *args, **kwargs) -> str:
+        # Not the default serialization, or updated since it was spliced
+        # (e.g. update_layout()): serialize it fully
+        if args or kwargs or not same(self._props(), self._spliced):
+            return super().to_json(*args, **kwargs)
+        return self._json
+
+    def _props(self) -> dict:
+        # As in to_plotly_json(), w/o its deep copy
+        return {"data": self._data, "layout": self._layout}
+
+
+def generate_map(state_sales: pd.Series) -> go.Figure:
+    # Total sales by state, e.g. straight from cube.query_cube()
+    states = state_sales.index.astype(str)  # May be categorical
+    sales = state_sales.to_numpy(dtype="<f8")
+    codes = [state_codes.get(state) for state in states]
+    arrays = {
+        "locations": codes,
+        "z": sales,
+        "text": codes,
+        "hovertext": [
+            f"{state}<br>${value:,.2f}" for state, value in zip(states, sales)
+        ],
+    }
+
+    # Only the arrays are new, so skip validating the template again
+    fig = MapFigure(
+        {
+            "data": [
+                {**trace, **{key: arrays[key] for key in keys}}
+                for trace, keys in zip(MAP_TEMPLATE["data"], MAP_ARRAYS)
+            ],
+            "layout": MAP_TEMPLATE["layout"],
+        },
+        _validate=False,
+    )
+
+    # Same encoding as Plotly's own: base64 for numbers, lists for text
+    encoded = {
+        "locations": json.dumps(codes),
+        "z": json.dumps({
+            "dtype": "f8",
+            "bdata": base64.b64encode(sales.tobytes()).decode(),
+        }),
+        "text": json.dumps(codes),
+        "hovertext": json.dumps(arrays["hovertext"]),
+    }
+    fig._json = MAP_JSON[0] + "".join(
+        encoded[part[:part.index('"')]] + part[part.index('"') + 1:]
+        for part in MAP_JSON[1:]
+    )
+    # A copy to spot later updates, sharing the arrays: they're only
+    # ever replaced, & compare by identity until then
+    shared = {id(array): array for array in arrays.values()}
+    fig._spliced = copy.deepcopy(fig._props(), shared)
+    return fig
+
+
 if __name__ == "__main__":
-    fig = generate_map(data)
+    data = get_dataset("orders")
+    fig = generate_map(data.groupby("State", observed=True)["Sales"].sum())
     fig.show()
\ No newline at end of file
@@ -0,0 +1,98 @@
+'''
+Pre-aggregated sales cube for the taipy_course dashboards.
+
+Sales are summed once at load over every
+Category x Sub-Category x State x Order Month cell, so the dashboard
+callbacks only have to slice the (small) cube instead of re-filtering
+and re-grouping the full order table on every click.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import numpy as np
+import pandas as pd
+
+from taipy_course.topk import top_k
+
+
+# +------+
+# | Cube |
+# +------+
+
+CUBE_DIMENSIONS = ['Category', 'Sub-Category', 'State', 'Order Month']
+
+
+def order_dates(data: pd.DataFrame) -> pd.Series:
+    '''Return the 'Order Date' column as datetime64, parsing if needed.'''
+    dates = data['Order Date']
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates, format='%d/%m/%Y')  # data.csv is d/m/Y
+
+
+def build_cube(data: pd.DataFrame) -> pd.Series:
+    '''Sum Sales over every Category/Sub-Category/State/Order Month cell.'''
+    return (
+        data
+        .assign(**{'Order Month': order_dates(data).dt.to_period('M')})
+        .groupby(CUBE_DIMENSIONS, observed=True)['Sales']
+        .sum()
+        .sort_index()  # Sorted MultiIndex makes .loc slicing cheap
+    )
+
+
+def extend_cube(cube: pd.Series, rows: pd.DataFrame) -> pd.Series:
+    '''Cube with newly appended order rows added in.'''
+    return cube.add(build_cube(rows), fill_value=0).sort_index()
+
+
+def query_cube(
+        cube: pd.Series,
+        start_date=None,
+        end_date=None,
+        category: str | None = None,
+        subcategory: str | None = None,
+) -> pd.Series:
+    '''
+    Total sales by state for the given filter, answered from the cube.
+
+    The date range has month resolution: every order month touched by
+    [start_date, end_date] is included in full.
+    '''
+    cells = cube
+
+    # Slice leading levels of the sorted index instead of masking
+    try:
+        if category is not None:
+            cells = cells.xs(category, level='Category', drop_level=False)
+        if subcategory is not None:
+            cells = cells.xs(
+                subcategory, level='Sub-Category', drop_level=False
+            )
+    except KeyError:  # No orders at all for this category/sub-category
+        cells = cube.iloc[:0]
+
+    # Keep only the order months inside the date range
+    months = cells.index.get_level_values('Order Month')
+    mask = np.ones(len(cells), dtype=bool)
+    if start_date is not None:
+        mask &= months >= pd.Period(pd.Timestamp(start_date), freq='M')
+    if end_date is not None:
+        mask &= months <= pd.Period(pd.Timestamp(end_date), freq='M')
+
+    return (
+        cells[mask]
+        .groupby(level='State', observed=True)
+        .sum()
+        .rename('Sales')
+    )
+
+
+def top_states(state_sales: pd.Series, n: int = 10) -> pd.DataFrame:
+    '''Top-n states by sales as a State/Sales frame for tgb.chart.'''
+    return (
+        top_k(state_sales, n)  # Partial selection, no full sort
+        .reset_index()  # Make state names a column instead of index
+    )
@@ -0,0 +1,213 @@
+'''
+Filters, Apply & top-10 chart shared by the taipy_course dashboards.
+
+A page imports the state variables & callbacks below (Taipy binds them
+by name in the page's module), binds apply_changes() to its Apply button
+& change_category() to its category selector, & adds the figures it
+shows besides the top-10 chart w/ add_view(). on_init() fills them all
+for each session, apply_changes() recomputes them off-thread, & so does
+refresh_changes() for appended orders. The order table is table.py's,
+listing the applied filters too.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import typing as t
+
+import pandas as pd
+
+from taipy_course.metrics import instrumented
+from taipy_course.push import push
+from taipy_course.queries import (
+    approximate,
+    facet_lov,
+    filter_key,
+    orders_table,
+    sales_chart_data,
+    sales_chart_estimate,
+    state_filters,
+)
+from taipy_course.sampling import error_bars
+from taipy_course.table import refresh_table
+from taipy_course.workers import submit
+
+
+# +---------+
+# | Backend |
+# +---------+
+
+chart_data = pd.DataFrame({'State': [], 'Sales': []})  # See on_init()
+
+# (value, 'value (lines, sales)') pairs counted by the query engine,
+# looked up again on Apply so they include appended orders
+categories = []  # See on_init()
+selected_category = 'Furniture'
+
+selected_subcategory = 'Bookcases'
+subcategories = []
+
+layout = {
+    'yaxis': {'title': 'Revenue (USD)'},
+    'title': 'Sales by State'
+}
+
+start_date = pd.to_datetime('2015-01-01')
+end_date = pd.to_datetime('2018-12-31')
+
+applied_filters = filter_key()  # All orders until filters are applied
+
+# The page's own figures by variable, & the layouts titled w/ them
+views: dict[str, t.Callable] = {}
+view_layouts: dict[str, tuple[str, str]] = {}
+
+
+def add_view(
+        name: str,
+        view: t.Callable,
+        layout: str | None = None,
+        title: str | None = None,
+):
+    '''
+    Show a figure in the page's name variable, for the applied filters.
+
+    view(state) gives the query computing it from the filters, run on
+    the worker pool as query(*filters), or None to leave the variable
+    be in that session. If given, the layout variable is titled e.g.
+    f'{title} for Furniture - Bookcases' on Apply.
+    '''
+    views[name] = view
+    if layout is not None:
+        view_layouts[name] = layout, title
+
+
+def view_queries(state) -> dict[str, t.Callable]:
+    '''The query of each view to compute for the session.'''
+    queries = {name: view(state) for name, view in views.items()}
+    return {name: query for name, query in queries.items() if query}
+
+
+def titled(title: str, filters: tuple, **layout) -> dict:
+    '''Chart layout titled for the category & sub-category of filters.'''
+    _, _, category, subcategory = filters
+    return {
+        'yaxis': {'title': 'Revenue (USD)'},
+        'title': f'{title} for {category} - {subcategory}',
+        **layout,
+    }
+
+
+def on_init(state):
+    # Deferred from startup, so the Gui serves before any order (or
+    # Plotly) is loaded: the 1st session loads them, later ones find the
+    # queries cached
+    refresh_table(state)
+    filters = state.applied_filters
+    push(
+        state,
+        categories=facet_lov('product'),
+        subcategories=facet_lov('product', state.selected_category),
+        chart_data=sales_chart_data(*filters),
+        **{
+            name: query(*filters)
+            for name, query in view_queries(state).items()
+        },
+    )
+
+
+@instrumented
+def change_category(state):
+    # Sub-categories w/ counts & sales in the applied dates, looked up
+    # rather than scanned
+    start_date, end_date, _, _ = state.applied_filters
+    subcategories = facet_lov(
+        'product', state.selected_category,
+        start_date=start_date, end_date=end_date,
+    )
+    state.subcategories = subcategories
+    # Auto-select a sub-cat, if any has orders in range
+    state.selected_subcategory = subcategories[0][0] if subcategories else None
+
+
+def compute_changes(filters, queries: dict[str, t.Callable]):
+    # Runs on the worker pool: the slow (but cached) queries for filters
+    orders_table(*filters)  # Warm the table cache for refresh_table()
+    chart_data = sales_chart_data(*filters)
+    values = {name: query(*filters) for name, query in queries.items()}
+    return filters, chart_data, values
+
+
+def show_changes(state, changes, refresh: bool = False):
+    # Back on the session once compute_changes() is done
+    filters, chart_data, values = changes
+    if refresh and filters != tuple(state.applied_filters):
+        return  # An Apply has shown other filters since
+
+    # 1st page of the filtered orders, the same page if only refreshed
+    state.applied_filters = filters
+    if not refresh:
+        state.table_page = 1
+    refresh_table(state)
+
+    # Selectors, charts & their layouts, only changes are resent
+    dates = {'start_date': filters[0], 'end_date': filters[1]}
+    layouts = {
+        layout: titled(title, filters)
+        for name, (layout, title) in view_layouts.items()
+        if name in values
+    }
+    push(
+        state,
+        categories=facet_lov('product', **dates),
+        subcategories=facet_lov('product', state.selected_category, **dates),
+        chart_data=chart_data,
+        layout=titled('Sales by State', filters),
+        **values,
+        **layouts,
+    )
+
+
+def show_estimate(state, filters):
+    # Approximate mode: top-10 estimated from a sample, w/ 95% error bars,
+    # until show_changes() replaces it w/ the exact one
+    estimate = sales_chart_estimate(*filters)
+    if estimate is None:
+        return  # Exact one already cached, so shown right away anyway
+    push(
+        state,
+        chart_data=estimate,
+        layout=titled(
+            '≈ Sales by State', filters, shapes=error_bars(estimate)
+        ),
+    )
+
+
+@instrumented
+def apply_changes(state):
+    # Read the filters now, compute off-thread & show when ready. A newer
+    # Apply from the same session supersedes this one.
+    filters = state_filters(state)
+    if approximate:
+        show_estimate(state, filters)  # From the sample, in milliseconds
+    queries = view_queries(state)
+    submit(
+        state,
+        lambda: compute_changes(filters, queries),
+        show_changes,
+        channel='apply_changes',
+    )
+
+
+def refresh_changes(state):
+    # Orders were appended, see ingest.follow_orders(): recompute for the
+    # applied filters, not those picked since w/o Apply. Not an Apply, so
+    # neither an estimate nor in its metrics (& superseding no Apply)
+    filters = tuple(state.applied_filters)
+    queries = view_queries(state)
+    submit(
+        state,
+        lambda: compute_changes(filters, queries),
+        lambda state, changes: show_changes(state, changes, refresh=True),
+        channel='refresh_changes',
+    )
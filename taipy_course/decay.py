@@ -0,0 +1,90 @@
+'''
+Vectorized, memoized damped cosine curves for 1_getting_started.
+
+A curve is cos(x/6) * exp(-x*decay/600) for x in [0, 100), sampled at
+n_points evenly spaced x (see positions()) & computed with NumPy in one
+go, so millions of points take milliseconds: more points make a curve
+smoother, not longer. Curves are kept per (decay, n_points) in an LRU
+cache bounded in bytes, and a curve with a cached one for a smaller
+decay is derived from it:
+
+    curve(d)[k] = curve(d')[k] * exp(-x[k] * (d - d') / 600)
+
+which skips the cosines (the factor is <= 1, so it never overflows).
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# +--------+
+# | Curves |
+# +--------+
+
+DOMAIN = 100  # x spans [0, DOMAIN), whatever the number of points
+
+
+def positions(n_points: int = 100) -> np.ndarray:
+    '''The x of each point of a curve, 0, 1, ... 99 for 100 points.'''
+    return np.arange(n_points) * (DOMAIN / n_points)
+
+
+class DecayCurves:
+    '''Damped cosine curves, memoized per decay & number of points.'''
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self._curves: OrderedDict[tuple[float, int], np.ndarray] = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, decay: float, n_points: int = 100) -> np.ndarray:
+        '''Read-only curve for decay, computed or derived if not cached.'''
+        key = (decay, n_points)
+        with self._lock:
+            if key in self._curves:
+                self._curves.move_to_end(key)
+                return self._curves[key]
+
+            # Closest cached curve w/ the same points & a smaller decay
+            below = [
+                cached for cached, points in self._curves
+                if points == n_points and cached < decay
+            ]
+            base = None
+            if below:
+                nearest = max(below)
+                base = nearest, self._curves[(nearest, n_points)]
+
+        x = positions(n_points)
+        if base is None:
+            curve = np.cos(x / 6) * np.exp(x * (-decay / 600))
+        else:
+            nearest, cached = base
+            curve = cached * np.exp(x * (-(decay - nearest) / 600))
+        curve.flags.writeable = False  # Shared by every session
+
+        with self._lock:
+            if key not in self._curves:
+                self._curves[key] = curve
+                self._bytes += curve.nbytes
+            while self._bytes > self.max_bytes and len(self._curves) > 1:
+                _, evicted = self._curves.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return curve
+
+
+curves = DecayCurves()
+
+
+def decay_curve(decay: float, n_points: int = 100) -> np.ndarray:
+    '''Shortcut for curves.get() on the shared, process-wide cache.'''
+    return curves.get(decay, n_points)
@@ -0,0 +1,571 @@
+'''
+Query engines for the taipy_course sales dashboards.
+
+Every engine runs the same pipeline (date filter -> category filter ->
+sub-category filter -> state groupby -> top-n) and return the same
+pandas objects, so the pages don't care which one is active:
+
+- 'pandas': eager filtering of the shared order table through its
+  bitmap indexes, with state totals answered from the sales cube, or
+  the per-day prefix sums for date ranges splitting a month.
+- 'polars': a LazyFrame over the Parquet cache (or partitioned Parquet
+  files), so filters and column selection are pushed down into the scan
+  and run multithreaded. Appended orders are scanned from memory.
+- 'streaming': out-of-core, for order histories larger than RAM. The
+  data ($TAIPY_COURSE_SOURCE, else data.csv) is read a chunk at a time
+  and per-chunk state totals are merged, so memory stays bounded.
+
+Engines also count & total the children of facet nodes for the
+selectors (children()), give sales trends (sales_trend()) & a sample of
+their orders for approximate answers (sample()), so no page needs the
+whole order table loaded unless its engine does.
+
+The polars & streaming engines only open the year/month/category partitions
+the filters can match when given partitioned data, e.g. from
+taipy_course.generator.
+
+Select one with the TAIPY_COURSE_ENGINE environment variable.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import os
+import threading
+import traceback
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from taipy_course.cube import query_cube, top_states
+from taipy_course.daily import DailySales
+from taipy_course.facets import HIERARCHIES
+from taipy_course.loader import (
+    CATEGORY_COLUMNS,
+    CHUNK_ROWS,
+    DATA_PATH,
+    partition_files,
+    read_chunks,
+)
+from taipy_course.metrics import metrics
+from taipy_course.registry import get_dataset
+from taipy_course.sampling import (
+    SAMPLE_COLUMNS,
+    StratifiedSample,
+    sample_chunks,
+)
+
+
+def _facet_filters(hierarchy: str, path: tuple) -> tuple[str, dict]:
+    '''Level of the children of a facet node, & column filters to it.'''
+    levels = HIERARCHIES[hierarchy]
+    return levels[len(path)], dict(zip(levels, path))
+
+
+class SourceSample:
+    '''
+    Stratified sample of an engine's own source, for approximate answers:
+    streamed once on a background thread, as it takes a full scan.
+    '''
+
+    def __init__(self, source: Path | str):
+        self.source = source
+        self.sample = None  # Until streamed
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def get(self) -> StratifiedSample | None:
+        '''The sample, or None until streamed (the 1st call starts it).'''
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._stream, name='order-sample', daemon=True
+                )
+                self._thread.start()
+        return self.sample
+
+    def _stream(self):
+        try:
+            chunks = read_chunks(self.source, columns=SAMPLE_COLUMNS)
+            self.sample = sample_chunks(chunks)
+        except Exception:  # No estimates then, only exact answers
+            traceback.print_exc()
+
+
+# +---------------+
+# | Pandas Engine |
+# +---------------+
+
+class PandasEngine:
+    '''Eager pandas pipeline over the shared order table and cube.'''
+
+    name = 'pandas'
+
+    def order_positions(
+            self, start_date, end_date, category, subcategory
+    ) -> np.ndarray:
+        '''Positions of the matching rows in the shared order table.'''
+        # AND the bitmaps of each filter instead of scanning the table
+        index = get_dataset('bitmap_index')
+        words = index.select(
+            start_date,
+            end_date,
+            **{'Category': category, 'Sub-Category': subcategory},
+        )
+        rows = index.rows(words)
+        metrics.add_rows(self.name, len(rows))
+        return rows
+
+    def filtered_orders(
+            self, start_date, end_date, category, subcategory
+    ) -> pd.DataFrame:
+        rows = self.order_positions(
+            start_date, end_date, category, subcategory
+        )
+        data = get_dataset('orders')
+        return data.iloc[rows].reset_index(drop=True)
+
+    def state_sales(
+            self, start_date, end_date, category, subcategory
+    ) -> pd.Series:
+        filters = start_date, end_date, category, subcategory
+        if _whole_months(start_date, end_date):
+            cube = get_dataset('sales_cube')
+            metrics.add_rows(self.name, len(cube))  # At most, it's sliced
+            return query_cube(cube, *filters)
+
+        # Partial months aren't resolved by the cube, but by the per-day
+        # prefix sums: two lookups per state/category/sub-category cell
+        daily = get_dataset('daily_sales')
+        metrics.add_rows(self.name, len(daily.cells))
+        return daily.state_sales(*filters)
+
+    def top_states(self, state_sales: pd.Series, n: int = 10) -> pd.DataFrame:
+        return top_states(state_sales, n)
+
+    def children(
+            self, hierarchy: str, *path, start_date=None, end_date=None
+    ) -> pd.DataFrame:
+        # Looked up in the facet index, see FacetIndex.children()
+        return get_dataset('facet_index').children(
+            hierarchy, *path, start_date=start_date, end_date=end_date
+        )
+
+    def sales_trend(
+            self, start_date, end_date, category, subcategory, freq='W'
+    ) -> pd.DataFrame:
+        # Any date range is 2 lookups per cell in the per-day prefix sums
+        filters = start_date, end_date, category, subcategory
+        return get_dataset('daily_sales').trend(*filters, freq=freq)
+
+    def sample(self) -> StratifiedSample | None:
+        '''Stratified sample of the orders, see sampling.py.'''
+        return get_dataset('order_sample')
+
+
+def _whole_months(start_date, end_date) -> bool:
+    '''Whether [start_date, end_date] covers only complete months.'''
+    starts_on_1st = start_date is None or start_date.day == 1
+    ends_on_last = (
+        end_date is None or (end_date + pd.Timedelta(days=1)).day == 1
+    )
+    return starts_on_1st and ends_on_last
+
+
+# +---------------+
+# | Polars Engine |
+# +---------------+
+
+class PolarsEngine:
+    '''Lazy Polars pipeline over the Parquet cache of the order table.'''
+
+    name = 'polars'
+
+    def __init__(self, source: Path | str | None = None):
+        # Imported by each method, so only this engine loads polars
+        # (~70 ms), once: later imports are a sys.modules lookup
+        try:
+            import polars  # Fail here if missing, not on the 1st query
+        except ImportError:
+            raise ImportError(
+                "The 'polars' engine needs polars installed"
+            ) from None
+        self.source = source  # Parquet file(s), else the data.csv cache
+        self._sample = None if source is None else SourceSample(source)
+
+    def _scan(self, start_date, end_date, **filters):
+        '''
+        LazyFrame of the orders in the date range w/ column == value
+        filters, nothing is read yet.
+        '''
+        import polars as pl
+
+        if self.source is not None:
+            # Only the partitions that may match, if partitioned at all
+            files = partition_files(
+                self.source, start_date, end_date, filters.get('Category')
+            )
+            orders = pl.scan_parquet(
+                # No match: one file for the schema, w/ all rows filtered
+                files or partition_files(self.source)[:1],
+                hive_partitioning=False,  # Keys are already columns
+            )
+            if not files:
+                orders = orders.filter(pl.lit(False))
+        else:  # The Parquet cache or Arrow file, & the appended orders
+            orders = get_dataset('scanned_orders').lazy()
+
+        # One predicate, pushed down into the scan by the optimizer
+        predicates = [pl.lit(True)]
+        if start_date is not None:
+            predicates.append(pl.col('Order Date') >= start_date)
+        if end_date is not None:
+            predicates.append(pl.col('Order Date') <= end_date)
+        for column, value in filters.items():
+            if value is not None:
+                predicates.append(pl.col(column) == value)
+        return orders.filter(pl.all_horizontal(predicates))
+
+    def filtered_orders(
+            self, start_date, end_date, category, subcategory
+    ) -> pd.DataFrame:
+        return (
+            self._scan(
+                start_date, end_date,
+                **{'Category': category, 'Sub-Category': subcategory},
+            )
+            .collect()
+            .to_pandas()
+        )
+
+    def state_sales(
+            self, start_date, end_date, category, subcategory
+    ) -> pd.Series:
+        import polars as pl
+
+        sales = (
+            self._scan(
+                start_date, end_date,
+                **{'Category': category, 'Sub-Category': subcategory},
+            )
+            .group_by('State')  # Only State & Sales are read from disk
+            .agg(pl.col('Sales').sum())
+            .sort('State')
+            .collect()
+            .to_pandas()
+        )
+        return sales.set_index('State')['Sales']
+
+    def top_states(self, state_sales: pd.Series, n: int = 10) -> pd.DataFrame:
+        import polars as pl
+
+        top = (
+            pl.from_pandas(state_sales.rename('Sales').reset_index())
+            .lazy()
+            .top_k(n, by='Sales')  # Partial selection, no full sort
+            .sort('Sales', descending=True)
+            .collect()
+            .to_pandas()
+        )
+        top['State'] = top['State'].astype(state_sales.index.dtype)
+        return top
+
+    def children(
+            self, hierarchy: str, *path, start_date=None, end_date=None
+    ) -> pd.DataFrame:
+        import polars as pl
+
+        level, filters = _facet_filters(hierarchy, path)
+        children = (
+            self._scan(start_date, end_date, **filters)
+            .group_by(level)
+            .agg(count=pl.len(), sales=pl.col('Sales').sum())
+            .sort(level)
+            .collect()
+            .to_pandas()
+        )
+        return children.set_index(level).astype({'count': int})
+
+    def sales_trend(
+            self, start_date, end_date, category, subcategory, freq='W'
+    ) -> pd.DataFrame:
+        import polars as pl
+
+        # Sales per day of the orders in range, summing only the matching
+        # ones (so, like the streaming engine, the trend spans the 1st to
+        # the last order in range, whatever the category)
+        matches = pl.lit(True)
+        for column, value in [
+            ('Category', category), ('Sub-Category', subcategory)
+        ]:
+            if value is not None:
+                matches &= pl.col(column) == value
+        daily = (
+            self._scan(start_date, end_date)
+            .group_by(pl.col('Order Date').dt.truncate('1d').alias('Date'))
+            .agg(pl.col('Sales').filter(matches).sum())
+            .collect()
+            .to_pandas()
+            .set_index('Date')['Sales']
+        )
+        if daily.empty:  # No order in range
+            return pd.DataFrame({'Date': pd.to_datetime([]), 'Sales': []})
+
+        days = pd.date_range(daily.index.min(), daily.index.max())
+        sales = daily.reindex(days, fill_value=0.0)
+        if freq == 'W':  # Weeks from Monday, the 1st one from the 1st day
+            mondays = days - pd.to_timedelta(days.dayofweek, unit='D')
+            sales = sales.groupby(mondays.where(mondays > days[0], days[0]))
+            sales = sales.sum()
+        return pd.DataFrame({
+            'Date': sales.index.astype('datetime64[ns]'),
+            'Sales': sales.to_numpy(),
+        })
+
+    def sample(self) -> StratifiedSample | None:
+        # The shared orders' sample, else one of the Parquet source
+        if self._sample is None:
+            return get_dataset('order_sample')
+        return self._sample.get()
+
+
+# +------------------+
+# | Streaming Engine |
+# +------------------+
+
+class StreamingEngine:
+    '''Out-of-core pandas pipeline, one chunk of the orders at a time.'''
+
+    name = 'streaming'
+
+    def __init__(
+            self,
+            source: Path | str | None = None,
+            chunk_rows: int = CHUNK_ROWS,
+            max_rows: int = 100_000,
+    ):
+        # CSV/Parquet file or directory of parts, see loader.read_chunks()
+        self.source = source or os.environ.get(
+            'TAIPY_COURSE_SOURCE', DATA_PATH
+        )
+        self.chunk_rows = chunk_rows
+        self.max_rows = max_rows  # Cap on the rows kept for the table
+        self._sample = SourceSample(self.source)
+
+    def _chunks(self, start_date, end_date, columns=None, **filters):
+        '''
+        Orders of each chunk in the date range w/ column == value
+        filters, read & filtered one by one.
+        '''
+        filters = {
+            column: value for column, value in filters.items()
+            if value is not None
+        }
+        if columns is not None:  # Read what the filters need too
+            columns = list(dict.fromkeys(
+                [*columns, 'Order Date', *filters]
+            ))
+        chunks = read_chunks(
+            self.source,
+            self.chunk_rows,
+            columns,
+            start_date,
+            end_date,
+            # Partitions of other months/categories are skipped
+            filters.get('Category'),
+        )
+        for chunk in chunks:
+            metrics.add_rows(self.name, len(chunk))
+            mask = np.ones(len(chunk), dtype=bool)
+            if start_date is not None:
+                mask &= chunk['Order Date'] >= start_date
+            if end_date is not None:
+                mask &= chunk['Order Date'] <= end_date
+            for column, value in filters.items():
+                mask &= chunk[column] == value
+            yield chunk[mask]
+
+    def _totals(self, by: str, start_date, end_date, **filters):
+        '''Order line count & sales per value of by, for the filters.'''
+        # Only one chunk & one partial total per value in memory at once,
+        # merged w/ their counts so values w/o orders can be told apart
+        totals = pd.DataFrame({'count': [], 'sales': []})
+        chunks = self._chunks(
+            start_date, end_date, columns=[by, 'Sales'], **filters
+        )
+        for chunk in chunks:
+            partial = (
+                chunk
+                .groupby(by, observed=True)['Sales']
+                .agg(count='size', sales='sum')
+            )
+            totals = totals.add(partial.rename(index=str), fill_value=0)
+        totals = totals[totals['count'] > 0].astype({'count': int})
+        return totals.sort_index().rename_axis(by)
+
+    def filtered_orders(
+            self, start_date, end_date, category, subcategory
+    ) -> pd.DataFrame:
+        '''
+        The first max_rows matching orders (all of them won't fit), w/
+        the number of matching orders in attrs['total_rows'].
+        '''
+        matches, n_rows, counted = [], 0, 0
+        filters = start_date, end_date, category, subcategory
+        # Unfiltered, Parquet row counts are in the file footers, else the
+        # rest of the scan past max_rows only counts
+        total_rows = None
+        if all(value is None for value in filters):
+            total_rows = self._stored_rows()
+        chunks = self._chunks(
+            start_date, end_date,
+            **{'Category': category, 'Sub-Category': subcategory},
+        )
+        for chunk in chunks:
+            if n_rows < self.max_rows:
+                matches.append(chunk.head(self.max_rows - n_rows))
+                n_rows += len(matches[-1])
+            elif total_rows is not None:
+                break
+            counted += len(chunk)
+
+        if not matches:  # Every partition pruned, read 1 row for the types
+            first = partition_files(self.source)[0]
+            matches.append(next(read_chunks(first, 1)).iloc[:0])
+
+        # Chunks have their own categories, so re-encode the whole lot
+        data = pd.concat(matches, ignore_index=True)
+        data = data.astype({column: 'category' for column in CATEGORY_COLUMNS})
+        if total_rows is None:
+            total_rows = counted
+        data.attrs['total_rows'] = total_rows
+        return data
+
+    def _stored_rows(self) -> int | None:
+        '''Row count of the source from its Parquet footers, else None.'''
+        files = partition_files(self.source)
+        if any(file.suffix != '.parquet' for file in files):
+            return None  # CSV has no row count but its own length
+        return sum(pq.ParquetFile(file).metadata.num_rows for file in files)
+
+    def state_sales(
+            self, start_date, end_date, category, subcategory
+    ) -> pd.Series:
+        totals = self._totals(
+            'State', start_date, end_date,
+            **{'Category': category, 'Sub-Category': subcategory},
+        )
+        totals.index = totals.index.astype('category')
+        return totals['sales'].rename('Sales')
+
+    def top_states(self, state_sales: pd.Series, n: int = 10) -> pd.DataFrame:
+        return top_states(state_sales, n)
+
+    def children(
+            self, hierarchy: str, *path, start_date=None, end_date=None
+    ) -> pd.DataFrame:
+        level, filters = _facet_filters(hierarchy, path)
+        return self._totals(level, start_date, end_date, **filters)
+
+    def sales_trend(
+            self, start_date, end_date, category, subcategory, freq='W'
+    ) -> pd.DataFrame:
+        # Per-day prefix sums of the orders in range, merged chunk by chunk
+        # (so the trend spans the 1st to the last order in range, not the
+        # days before or after it that have none)
+        index = None
+        columns = ['Category', 'Sub-Category', 'Sales']
+        for chunk in self._chunks(start_date, end_date, columns=columns):
+            if len(chunk) == 0:
+                continue
+            if index is None:
+                index = DailySales(chunk, columns=columns[:2])
+            else:
+                index = index.extended(chunk)
+        if index is None:  # No order in range
+            return pd.DataFrame({'Date': pd.to_datetime([]), 'Sales': []})
+        return index.trend(
+            start_date, end_date, category, subcategory, freq=freq
+        )
+
+    def sample(self) -> StratifiedSample | None:
+        # Streamed from the source, not the shared orders
+        return self._sample.get()
+
+
+# +-----------+
+# | Selection |
+# +-----------+
+
+ENGINES = {
+    'pandas': PandasEngine,
+    'polars': PolarsEngine,
+    'streaming': StreamingEngine,
+}
+
+
+def get_engine(name: str | None = None):
+    '''Engine by name, defaulting to $TAIPY_COURSE_ENGINE or pandas.'''
+    name = name or os.environ.get('TAIPY_COURSE_ENGINE', 'pandas')
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(
+            f'Unknown engine {name!r}, choose from {sorted(ENGINES)}'
+        ) from None
+
+
+# +------+
+# | Main |
+# +------+
+
+if __name__ == '__main__':
+    # Check every engine agrees w/ pandas on a few representative filters
+    engines = [get_engine(name) for name in ENGINES]
+    filters = [
+        (None, None, None, None),
+        (pd.Timestamp('2017-01-01'), pd.Timestamp('2017-12-31'),
+         'Technology', 'Phones'),
+        (pd.Timestamp('2015-01-01'), pd.Timestamp('2018-12-31'),
+         'Furniture', None),
+        (pd.Timestamp('2016-03-15'), pd.Timestamp('2016-09-10'),
+         None, None),
+    ]
+    pandas_engine = engines[0]
+    for key in filters:
+        for engine in engines[1:]:
+            pd.testing.assert_frame_equal(
+                pandas_engine.filtered_orders(*key),
+                engine.filtered_orders(*key),
+                check_dtype=False,
+                check_categorical=False,
+            )
+            pd.testing.assert_series_equal(
+                pandas_engine.state_sales(*key).astype(float),
+                engine.state_sales(*key),
+                check_index_type=False,
+                check_categorical=False,
+            )
+            for path in (), ('Furniture',):
+                pd.testing.assert_frame_equal(
+                    pandas_engine.children(
+                        'product', *path, start_date=key[0], end_date=key[1]
+                    ),
+                    engine.children(
+                        'product', *path, start_date=key[0], end_date=key[1]
+                    ),
+                    check_dtype=False,
+                    check_index_type=False,
+                    check_categorical=False,
+                )
+        # Both out-of-pandas trends span the orders in range, not the data
+        for freq in 'D', 'W':
+            pd.testing.assert_frame_equal(
+                engines[1].sales_trend(*key, freq=freq),
+                engines[2].sales_trend(*key, freq=freq),
+                check_dtype=False,
+            )
+        print(f'{key}: engines agree')
@@ -0,0 +1,136 @@
+'''
+Faceted navigation index for the taipy_course selectors.
+
+Row counts and sales totals are precomputed once for every node of the
+Category -> Sub-Category -> Product and Region -> State -> City
+hierarchies. The children of any node (e.g. the sub-categories of
+'Furniture') are then a dict lookup rather than a scan of the orders,
+so selectors can show counts for free.
+
+Those totals are all-time. For a date range, the top two levels of each
+hierarchy also keep per-day prefix sums (see daily.py), so the children
+of their nodes are summed between two days in one pass over the cells.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import copy
+
+import pandas as pd
+
+from taipy_course.daily import DailySales
+
+
+# +--------+
+# | Facets |
+# +--------+
+
+HIERARCHIES = {
+    'product': ['Category', 'Sub-Category', 'Product Name'],
+    'location': ['Region', 'State', 'City'],
+}
+DATED_LEVELS = 2  # Levels of each hierarchy counted between dates
+
+
+def labels(children: pd.DataFrame) -> list[tuple[str, str]]:
+    '''Children as (value, label w/ count & sales) for tgb.selector.'''
+    # Counts are rows, i.e. order lines: an order may hold several
+    return [
+        (str(value), f'{value} ({count:,} lines, ${sales:,.0f})')
+        for value, count, sales in children.itertuples()
+    ]
+
+
+class FacetIndex:
+    '''Children, row counts & sales of every node of HIERARCHIES.'''
+
+    def __init__(self, data: pd.DataFrame, hierarchies=HIERARCHIES):
+        self.hierarchies = hierarchies
+        self._daily = {
+            hierarchy: DailySales(data, levels[:DATED_LEVELS])
+            for hierarchy, levels in hierarchies.items()
+        }
+
+        # (hierarchy, path to a node) -> count & sales of its children
+        self._children: dict[tuple[str, tuple], pd.DataFrame] = {}
+        for hierarchy, levels in hierarchies.items():
+            for depth in range(len(levels)):
+                totals = (
+                    data
+                    .groupby(levels[:depth + 1], observed=True)['Sales']
+                    .agg(count='size', sales='sum')
+                )
+                if depth == 0:
+                    self._children[hierarchy, ()] = totals
+                    continue
+                # Scalar level for a single parent, else paths are 1-tuples
+                parents = levels[0] if depth == 1 else levels[:depth]
+                for path, children in totals.groupby(
+                        level=parents, observed=True
+                ):
+                    path = path if isinstance(path, tuple) else (path,)
+                    self._children[hierarchy, path] = (
+                        children.droplevel(levels[:depth])
+                    )
+
+    @property
+    def nbytes(self) -> int:
+        # Shallow, the category labels are shared with the order table
+        return sum(
+            int(children.memory_usage().sum())
+            for children in self._children.values()
+        ) + sum(daily.nbytes for daily in self._daily.values())
+
+    def extended(self, rows: pd.DataFrame) -> 'FacetIndex':
+        '''New index with appended order rows added to the totals.'''
+        new = FacetIndex(rows, self.hierarchies)
+        extended = copy.copy(self)
+        extended._children = dict(self._children)
+        extended._daily = {
+            hierarchy: daily.extended(rows)
+            for hierarchy, daily in self._daily.items()
+        }
+        for key, children in new._children.items():
+            if key in extended._children:
+                children = (
+                    extended._children[key]
+                    .add(children, fill_value=0)
+                    .astype({'count': int})
+                )
+            extended._children[key] = children
+        return extended
+
+    def children(
+            self, hierarchy: str, *path, start_date=None, end_date=None
+    ) -> pd.DataFrame:
+        '''
+        Count & sales of each child of a node, e.g.
+        children('product', 'Furniture') for its sub-categories, over
+        all orders or those between start_date & end_date.
+
+        Children w/o any order in range are left out. Raises ValueError
+        for dates below the DATED_LEVELS top levels.
+        '''
+        if start_date is None and end_date is None:
+            empty = pd.DataFrame({'count': [], 'sales': []})
+            return self._children.get((hierarchy, path), empty)
+
+        levels = self.hierarchies[hierarchy]
+        if len(path) >= DATED_LEVELS:
+            raise ValueError(
+                f'No counts between dates below {levels[DATED_LEVELS - 1]}'
+            )
+        return self._daily[hierarchy].totals(
+            start_date, end_date, by=levels[len(path)],
+            **dict(zip(levels, path)),
+        )
+
+    def lov(
+            self, hierarchy: str, *path, start_date=None, end_date=None
+    ) -> list[tuple[str, str]]:
+        '''Children as (value, label w/ count & sales) for tgb.selector.'''
+        return labels(self.children(
+            hierarchy, *path, start_date=start_date, end_date=end_date
+        ))
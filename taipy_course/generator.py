@@ -0,0 +1,197 @@
+'''
+Synthetic order data at any scale, statistically similar to data.csv.
+
+Orders are built from the ones in data.csv: the number of lines per
+order, the customer, the shipping address and the order date & shipping
+of every synthetic order are each drawn from the real orders, and its
+lines (product & sales) from the real order lines. Category, state and
+seasonal date distributions therefore match the source, and orders keep
+several rows under one Order ID. Rows are streamed in fixed-size chunks,
+so memory stays bounded whatever the total, and written partitioned by
+order year/month (& optionally Category) for partition pruning:
+
+    python -m taipy_course.generator orders/ --rows 100000000
+    python -m taipy_course.generator orders/ --rows 1000000 --format csv
+    python -m taipy_course.generator orders/ --by-category
+
+The same seed (& chunk size) always gives the same rows.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import argparse
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from taipy_course.loader import CHUNK_ROWS, load_orders, write_partitions
+
+
+# +-----------+
+# | Templates |
+# +-----------+
+
+# Columns drawn together, from the same real order (or order line)
+CUSTOMER_COLUMNS = ['Customer ID', 'Customer Name', 'Segment']
+ADDRESS_COLUMNS = ['Country', 'City', 'State', 'Postal Code', 'Region']
+SHIPPING_COLUMNS = ['Order Date', 'Ship Date', 'Ship Mode']
+LINE_COLUMNS = [
+    'Product ID', 'Category', 'Sub-Category', 'Product Name', 'Sales'
+]
+ORDER_COLUMNS = CUSTOMER_COLUMNS + ADDRESS_COLUMNS + SHIPPING_COLUMNS
+
+
+def order_templates(source: pd.DataFrame) -> pd.DataFrame:
+    '''One row per real order: its lines count, customer, address, etc.'''
+    orders = source.groupby('Order ID', sort=False).agg(
+        **{column: (column, 'first') for column in ORDER_COLUMNS},
+        lines=('Row ID', 'size'),
+    )
+    orders['Prefix'] = orders.index.str[:2]  # e.g. CA in CA-2017-152156
+    orders = orders.reset_index(drop=True)
+
+    # Keep the categories of the source, 'first' drops unused ones
+    for column in ORDER_COLUMNS:
+        orders[column] = orders[column].astype(source[column].dtype)
+    return orders
+
+
+# +-----------+
+# | Generator |
+# +-----------+
+
+def generate_orders(
+        n_rows: int,
+        seed: int = 0,
+        chunk_rows: int = CHUNK_ROWS,
+        years: int = 4,
+        source: pd.DataFrame | None = None,
+) -> t.Iterator[pd.DataFrame]:
+    '''
+    Yield n_rows synthetic orders, chunk_rows at a time.
+
+    Order dates span the last years years of the source (its own 4 by
+    default), shifted back by whole 52-week blocks to keep weekdays.
+    '''
+    source = load_orders() if source is None else source
+    orders = order_templates(source)
+    lines = source[LINE_COLUMNS]
+    columns = list(source.columns)
+    rng = np.random.default_rng(seed)
+
+    last_year = source['Order Date'].max().year
+    span = last_year - source['Order Date'].min().year + 1
+    max_shift = max(years - span, 0)
+
+    row_id, order_number = 1, 100_000
+    while row_id <= n_rows:
+        size = min(chunk_rows, n_rows - row_id + 1)
+
+        # Enough orders to fill the chunk, the last one may be cut short
+        n_orders = int(size / orders['lines'].mean() * 1.1) + 1
+        n_lines = orders['lines'].to_numpy()[
+            rng.integers(len(orders), size=n_orders)
+        ]
+        while n_lines.sum() < size:
+            n_lines = np.append(n_lines, n_lines[:n_orders])
+
+        # Per order, each group of columns comes from its own real order
+        chunk = pd.concat(
+            [
+                orders.loc[
+                    rng.integers(len(orders), size=len(n_lines)), group
+                ].reset_index(drop=True)
+                for group in [
+                    CUSTOMER_COLUMNS,
+                    ADDRESS_COLUMNS,
+                    SHIPPING_COLUMNS + ['Prefix'],
+                ]
+            ],
+            axis=1,
+        )
+        shift = pd.to_timedelta(
+            52 * rng.integers(0, max_shift + 1, size=len(n_lines)), unit='W'
+        )
+        chunk['Order Date'] -= shift
+        chunk['Ship Date'] -= shift
+        chunk['Order ID'] = (
+            chunk['Prefix'].astype(str)
+            + '-' + chunk['Order Date'].dt.year.astype(str)
+            + '-' + pd.Series(
+                np.arange(order_number, order_number + len(n_lines))
+            ).astype(str)
+        )
+        order_number += len(n_lines)
+
+        # One row per order line, then cut to the chunk size
+        chunk = chunk.loc[np.repeat(chunk.index, n_lines)[:size]]
+        chunk = chunk.reset_index(drop=True)
+        chunk[LINE_COLUMNS] = (
+            lines.iloc[rng.integers(len(lines), size=size)]
+            .reset_index(drop=True)
+        )
+        chunk['Row ID'] = np.arange(row_id, row_id + size)
+        row_id += size
+
+        yield chunk[columns]
+
+
+def write_orders(
+        directory: Path | str,
+        n_rows: int,
+        seed: int = 0,
+        chunk_rows: int = CHUNK_ROWS,
+        years: int = 4,
+        format: str = 'parquet',
+        by_category: bool = False,
+) -> list[Path]:
+    '''
+    Write generate_orders() under year=/month=[/category=] partitions of
+    directory, one part file per chunk & partition.
+    '''
+    paths = []
+    chunks = generate_orders(n_rows, seed, chunk_rows, years)
+    for number, chunk in enumerate(chunks):
+        paths += write_partitions(
+            chunk, directory, f'part-{number:05d}', by_category, format
+        )
+    return paths
+
+
+# +------+
+# | Main |
+# +------+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('directory', help='output directory for the parts')
+    parser.add_argument('--rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument(
+        '--years', type=int, default=4,
+        help='span of the order dates, ending with the last in data.csv',
+    )
+    parser.add_argument(
+        '--format', choices=['parquet', 'csv'], default='parquet'
+    )
+    parser.add_argument(
+        '--by-category', action='store_true',
+        help='partition by Category too, under the year/month ones',
+    )
+    args = parser.parse_args()
+
+    paths = write_orders(
+        args.directory,
+        args.rows,
+        args.seed,
+        args.chunk_rows,
+        args.years,
+        args.format,
+        args.by_category,
+    )
+    print(f'Wrote {args.rows:,} orders to {len(paths)} files')
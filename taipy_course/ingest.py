@@ -0,0 +1,233 @@
+'''
+Incremental ingestion of orders appended to data.csv.
+
+OrderTail follows the CSV like `tail -f`: each poll parses only the
+lines written since the previous one and folds them into the shared
+datasets (order table, sales cube, bitmap index) without reloading the
+file. follow() polls on a background thread and refreshes every
+connected Taipy session when new orders arrive.
+
+Behind taipy_course.serve, only the server tails the CSV: publish()
+writes each batch of appended orders to an Arrow file of its own next
+to the one its workers map, & each worker follows them w/ SharedOrders,
+folding the new rows into its datasets like the tail does. Only when
+data.csv is replaced are all orders republished & reloaded. So every
+worker serves the same orders. follow_orders() picks either side,
+or neither for an engine reading its own source (see engines.py).
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import io
+import os
+import threading
+import time
+import traceback
+import typing as t
+from pathlib import Path
+
+import pandas as pd
+
+from taipy_course.loader import (
+    DATA_PATH,
+    SHARED_PATH,
+    append_orders,
+    attach_batches,
+    parse_orders,
+    publish_orders,
+)
+from taipy_course import queries
+from taipy_course.registry import get_dataset, registry
+
+
+# +------+
+# | Tail |
+# +------+
+
+class OrderTail:
+    '''Parse & append the orders written to a CSV since the last poll.'''
+
+    def __init__(self, path: Path | str = DATA_PATH):
+        self.path = Path(path)
+        self.reloads = 0  # Times the file was replaced/truncated
+        self.rewind()
+
+    def rewind(self):
+        '''Treat everything currently in the file as already loaded.'''
+        get_dataset('orders')
+        with open(self.path, 'rb') as file:
+            self.inode = os.fstat(file.fileno()).st_ino
+            self.header = file.readline()
+            self.offset = file.seek(0, io.SEEK_END)
+            self.last_bytes = self._last_bytes(file)
+
+    def _last_bytes(self, file: t.BinaryIO) -> bytes:
+        '''Up to 256 bytes of file before offset, to spot rewrites.'''
+        start = max(len(self.header), self.offset - 256)
+        file.seek(start)
+        return file.read(self.offset - start)
+
+    def poll(self) -> pd.DataFrame | None:
+        '''Append any new complete lines, returning them as orders.'''
+        with open(self.path, 'rb') as file:
+            # Replaced (new inode), truncated, or truncated & rewritten
+            # past the offset (the bytes before it changed): reload all
+            stat = os.fstat(file.fileno())
+            if (
+                stat.st_ino != self.inode
+                or stat.st_size < self.offset
+                or self._last_bytes(file) != self.last_bytes
+            ):
+                registry.reload()
+                self.rewind()
+                self.reloads += 1
+                return None
+
+            file.seek(self.offset)
+            chunk = file.read()
+
+        # A line still being written has no newline yet, leave it be
+        end = chunk.rfind(b'\n') + 1
+        if not end:
+            return None
+        self.offset += end
+        self.last_bytes = (self.last_bytes + chunk[:end])[-256:]
+
+        rows = parse_orders(io.BytesIO(self.header + chunk[:end]))
+        if rows.empty:
+            return None
+        registry.append(rows)
+        return rows
+
+    def changed(self) -> bool:
+        '''Poll, returning whether orders were appended or reloaded.'''
+        reloads = self.reloads
+        return self.poll() is not None or self.reloads != reloads
+
+    def follow(
+            self,
+            gui,
+            refresh: t.Callable | None = None,
+            interval: float = 5.0,
+    ) -> threading.Thread:
+        '''Poll every interval seconds, calling refresh(state) on appends.'''
+        return _poll_every(interval, self.changed, _broadcast(gui, refresh))
+
+    def publish(
+            self, path: Path | str = SHARED_PATH, interval: float = 5.0
+    ) -> threading.Thread:
+        '''
+        Publish the orders to path, then poll every interval seconds &
+        publish each batch of appended orders next to it, or all orders
+        again on reloads, for SharedOrders to pick up.
+        '''
+        rows, reloads = None, self.reloads
+
+        def changed() -> bool:
+            nonlocal rows, reloads
+            rows, reloaded = self.poll(), self.reloads != reloads
+            reloads = self.reloads
+            return rows is not None or reloaded
+
+        def republish():
+            if rows is None:  # Reloaded, the batches are obsolete
+                publish_orders(get_dataset('orders'), path)
+            else:  # Only the new rows, not the orders already published
+                append_orders(rows, path)
+
+        republish()
+        return _poll_every(interval, changed, republish)
+
+
+class SharedOrders:
+    '''Follow the orders OrderTail.publish() appends to or replaces.'''
+
+    def __init__(self, path: Path | str = SHARED_PATH):
+        self.path = Path(path)
+        self.attach()
+
+    def _version(self) -> tuple[int, int]:
+        # Published by rename, so a new file is a new inode
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns
+
+    def attach(self):
+        '''Load the published orders, & the batches appended to them.'''
+        self.version = self._version()  # Before, so a newer one reloads
+        self.batches = 0
+        get_dataset('orders')
+        self.catch_up()
+
+    def catch_up(self) -> bool:
+        '''Append any batches not yet appended, returning whether any.'''
+        appended = self.batches
+        batches = attach_batches(
+            self.path, self.version[0], start=self.batches + 1
+        )
+        for rows in batches:
+            registry.append(rows)  # Indexes extended, not rebuilt
+            self.batches += 1
+        return self.batches != appended
+
+    def changed(self) -> bool:
+        '''Poll, returning whether orders were appended or reloaded.'''
+        if self._version() != self.version:  # Republished: start over
+            registry.reload()
+            self.attach()
+            return True
+        return self.catch_up()
+
+    def follow(
+            self,
+            gui,
+            refresh: t.Callable | None = None,
+            interval: float = 5.0,
+    ) -> threading.Thread:
+        '''Poll every interval seconds, calling refresh(state) on changes.'''
+        return _poll_every(interval, self.changed, _broadcast(gui, refresh))
+
+
+def follow_orders(
+        gui, refresh: t.Callable | None = None, interval: float = 5.0
+) -> threading.Thread | None:
+    '''
+    Keep a Gui's orders up to date, calling refresh(state) on changes:
+    from the file published by taipy_course.serve in its workers (which
+    set $TAIPY_COURSE_SHARED), else by tailing data.csv. Nothing to do
+    (None) when the engine reads its own source, not the shared orders.
+    '''
+    if getattr(queries.engine, 'source', None) is not None:
+        return None
+    shared = os.environ.get('TAIPY_COURSE_SHARED')
+    follower = SharedOrders(shared) if shared else OrderTail()
+    return follower.follow(gui, refresh, interval)
+
+
+def _broadcast(gui, refresh: t.Callable | None) -> t.Callable[[], None]:
+    '''Call refresh(state) for every session of gui, if given.'''
+    def run():
+        if refresh is not None:
+            gui.broadcast_callback(refresh)  # Every session
+    return run
+
+
+def _poll_every(
+        interval: float,
+        changed: t.Callable[[], bool],
+        then: t.Callable[[], None],
+) -> threading.Thread:
+    '''Call then() after each changed() poll returning True, on a thread.'''
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                if changed():
+                    then()
+            except Exception:  # e.g. a malformed line, keep following
+                traceback.print_exc()
+
+    thread = threading.Thread(target=run, name='order-tail', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,450 @@
+'''
+Typed loader for the taipy_course order data.
+
+data.csv is parsed once into typed columns (datetime64 dates,
+categorical dimensions, float Sales) and written to a Parquet cache
+next to it. Later starts reload the cache with a memory-mapped read
+for as long as the source file is unchanged.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import copy
+import typing as t
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from pyarrow import feather
+
+
+# +--------+
+# | Schema |
+# +--------+
+
+# Next to this file, whatever the working directory of the app
+DATA_PATH = Path(__file__).parent / 'data.csv'
+CACHE_DIR = Path(__file__).parent / '.cache'
+SHARED_PATH = CACHE_DIR / 'orders.arrow'  # See publish_orders()
+
+DATE_COLUMNS = ['Order Date', 'Ship Date']
+DATE_FORMAT = '%d/%m/%Y'  # e.g. 08/11/2017 is 8 Nov 2017
+
+# Low/medium-cardinality text columns, stored as pandas categoricals
+CATEGORY_COLUMNS = [
+    'Ship Mode',
+    'Customer ID',
+    'Customer Name',
+    'Segment',
+    'Country',
+    'City',
+    'State',
+    'Region',
+    'Product ID',
+    'Category',
+    'Sub-Category',
+    'Product Name',
+]
+
+CSV_DTYPES = {
+    **{column: 'category' for column in CATEGORY_COLUMNS},
+    'Sales': 'float64',
+}
+
+CHUNK_ROWS = 1_000_000  # Rows per chunk when streaming larger-than-RAM data
+
+
+# +---------+
+# | Loading |
+# +---------+
+
+def parse_orders(path: Path | str | t.IO = DATA_PATH) -> pd.DataFrame:
+    '''Parse the order CSV (a path or open file) into typed columns.'''
+    return parse_dates(pd.read_csv(path, dtype=CSV_DTYPES))
+
+
+def parse_dates(data: pd.DataFrame) -> pd.DataFrame:
+    '''Parse the d/m/Y date columns (those present) of raw CSV orders.'''
+    for column in DATE_COLUMNS:
+        if column in data:
+            data[column] = pd.to_datetime(data[column], format=DATE_FORMAT)
+    return data
+
+
+def cache_path(path: Path | str = DATA_PATH) -> Path:
+    '''Parquet cache file for the current version of the source CSV.'''
+    path = Path(path)
+    stat = path.stat()
+
+    # Any edit to the CSV changes its mtime and/or size, & so the key
+    key = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+    return CACHE_DIR / f'{path.stem}-{key}.parquet'
+
+
+def load_orders(path: Path | str = DATA_PATH) -> pd.DataFrame:
+    '''Load the typed order table, from the Parquet cache when fresh.'''
+    cached = cache_path(path)
+    if cached.exists():
+        return pd.read_parquet(cached, memory_map=True)
+
+    data = parse_orders(path)
+
+    # Drop caches of older versions of the same file before writing
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in CACHE_DIR.glob(f'{Path(path).stem}-*.parquet'):
+        stale.unlink()
+
+    # Write-then-rename so a concurrent reader never sees a partial file
+    partial = cached.with_suffix('.partial')
+    data.to_parquet(partial, index=False)
+    partial.replace(cached)
+
+    return data
+
+
+def publish_orders(data: pd.DataFrame, path: Path | str = SHARED_PATH):
+    '''
+    Write orders to an uncompressed Arrow file for attach_orders().
+
+    Unlike Parquet, the file needs no decoding, so every process mapping
+    it shares one copy through the OS page cache. Batches appended to
+    the orders it replaces (see append_orders()) are deleted.
+    '''
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _write_arrow(data, path)
+    for batch in path.parent.glob(f'{path.stem}-*{path.suffix}'):
+        batch.unlink(missing_ok=True)
+
+
+def append_orders(rows: pd.DataFrame, path: Path | str = SHARED_PATH):
+    '''
+    Publish orders appended to the ones at path as its next batch file,
+    w/o rewriting path, for attach_batches().
+    '''
+    inode = Path(path).stat().st_ino
+    number = 1
+    while batch_path(path, inode, number).exists():
+        number += 1
+    _write_arrow(rows, batch_path(path, inode, number))
+
+
+def attach_orders(path: Path | str = SHARED_PATH) -> pd.DataFrame:
+    '''Orders published by publish_orders(), memory-mapped read-only.'''
+    table = feather.read_table(path, memory_map=True)
+
+    # Numbers w/o nulls, dates & category codes stay views of the file
+    return table.to_pandas(split_blocks=True)
+
+
+def attach_batches(
+        path: Path | str, inode: int, start: int = 1
+) -> t.Iterator[pd.DataFrame]:
+    '''
+    Batches appended to the orders at path, the file w/ that inode,
+    from the start-th one on, in order.
+    '''
+    number = start
+    while True:
+        try:
+            rows = attach_orders(batch_path(path, inode, number))
+        except FileNotFoundError:  # Not appended yet, or path replaced
+            return
+        yield rows
+        number += 1
+
+
+def batch_path(path: Path | str, inode: int, number: int) -> Path:
+    '''Path of the number-th batch appended to the orders at path.'''
+    # Keyed by inode, as path is replaced by rename: e.g. orders-1f3-2.arrow
+    path = Path(path)
+    return path.with_name(f'{path.stem}-{inode:x}-{number}{path.suffix}')
+
+
+def _write_arrow(data: pd.DataFrame, path: Path):
+    '''Write-then-rename, so an attaching process never sees part of it.'''
+    partial = path.with_suffix('.partial')
+    feather.write_feather(data, partial, compression='uncompressed')
+    partial.replace(path)
+
+
+def read_chunks(
+        path: Path | str = DATA_PATH,
+        chunk_rows: int = CHUNK_ROWS,
+        columns: list[str] | None = None,
+        start_date=None,
+        end_date=None,
+        category: str | None = None,
+) -> t.Iterator[pd.DataFrame]:
+    '''
+    Stream typed orders chunk_rows at a time, never all in memory.
+
+    path is a CSV or Parquet file, or a (partitioned) directory of part
+    files such as the ones written by taipy_course.generator. Only
+    columns are read, if given, and only the partitions that may hold
+    orders within the date range & category, see partition_files().
+    '''
+    for part in partition_files(path, start_date, end_date, category):
+        if part.suffix == '.parquet':
+            file = pq.ParquetFile(part)
+            for batch in file.iter_batches(chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        elif part.suffix == '.csv':
+            with pd.read_csv(
+                    part,
+                    dtype=CSV_DTYPES,
+                    usecols=columns,
+                    chunksize=chunk_rows,
+            ) as chunks:
+                for chunk in chunks:
+                    yield parse_dates(chunk)
+
+
+# +------------+
+# | Partitions |
+# +------------+
+
+# Hive-style directories, e.g. year=2017/month=11/category=Technology
+PARTITION_KEYS = ['year', 'month', 'category']
+
+
+def write_partitions(
+        data: pd.DataFrame,
+        directory: Path | str,
+        name: str,
+        by_category: bool = False,
+        format: str = 'parquet',
+) -> list[Path]:
+    '''
+    Write orders as name.<format> files under year=/month=[/category=]
+    partition directories, one per distinct value, & return the paths.
+    '''
+    months = data['Order Date'].dt.to_period('M')
+    keys = [months.dt.year, months.dt.month]
+    if by_category:
+        keys.append(data['Category'])
+
+    paths = []
+    for values, rows in data.groupby(keys, observed=True):
+        folder = Path(directory, *(
+            f'{key}={quote(str(value))}'
+            for key, value in zip(PARTITION_KEYS, values)
+        ))
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f'{name}.{format}'
+        if format == 'parquet':
+            rows.to_parquet(path, index=False)
+        else:  # Same layout as data.csv, so parse_orders() can read it
+            rows = rows.astype({'Postal Code': 'Int64'})  # No '.0'
+            rows.to_csv(path, index=False, date_format=DATE_FORMAT)
+        paths.append(path)
+    return paths
+
+
+def partition_files(
+        path: Path | str,
+        start_date=None,
+        end_date=None,
+        category: str | None = None,
+) -> list[Path]:
+    '''
+    Part files of path that may hold orders in the date range/category.
+
+    Partitions are pruned on their directory names alone, w/o opening
+    any file. A plain file, or a directory w/o partitions, is returned
+    in full.
+    '''
+    path = Path(path)
+    if not path.is_dir():
+        return [path]
+
+    start = None if start_date is None else pd.Timestamp(start_date)
+    end = None if end_date is None else pd.Timestamp(end_date)
+
+    files = []
+    for file in sorted(path.rglob('*.*')):
+        if file.suffix not in ('.csv', '.parquet'):
+            continue
+        partition = dict(
+            part.split('=', 1)
+            for part in file.relative_to(path).parent.parts
+            if '=' in part
+        )
+
+        # Time span of the partition: a month, a year, or everything
+        if 'year' in partition:
+            freq = 'M' if 'month' in partition else 'Y'
+            period = pd.Period(
+                f"{partition['year']}-{partition.get('month', '01')}",
+                freq=freq,
+            )
+            if start is not None and period.end_time < start:
+                continue
+            if end is not None and period.start_time > end:
+                continue
+        if (
+            category is not None
+            and 'category' in partition
+            and unquote(partition['category']) != category
+        ):
+            continue
+        files.append(file)
+    return files
+
+
+# +-----------+
+# | Appending |
+# +-----------+
+
+class OrderColumns:
+    '''
+    Columns of the order table w/ room for appended orders.
+
+    Appends write into preallocated column buffers, doubling them when
+    full, so adding k orders costs O(k) amortised rather than a copy of
+    the table. frame() views the rows so far w/o copying. Categories
+    new to a column are added after the existing ones, which keeps the
+    codes already written valid (but the categories unsorted).
+    '''
+
+    def __init__(self, data: pd.DataFrame):
+        self.n_rows = len(data)
+        self._buffers: dict[str, np.ndarray] = {}  # Codes for categoricals
+        self._categories: dict[str, pd.Index] = {}
+        for column in data:
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                self._categories[column] = values.cat.categories
+                values = values.cat.codes
+            # The loaded arrays, full: the 1st append moves to new buffers
+            self._buffers[column] = values.to_numpy()
+
+    @property
+    def nbytes(self) -> int:
+        # Spare room only, the rows themselves are counted as 'orders'
+        return sum(
+            (len(buffer) - self.n_rows) * buffer.itemsize
+            for buffer in self._buffers.values()
+        )
+
+    def _codes(self, column: str, values: pd.Series) -> np.ndarray:
+        '''Codes of values in column's categories, adding new ones.'''
+        values = values.astype('category')
+        categories = self._categories[column]
+        added = values.cat.categories.difference(categories)
+        if len(added):
+            categories = self._categories[column] = categories.append(added)
+
+        # Same code dtype as pandas would pick, so frame() doesn't cast
+        dtype = next(
+            dtype for dtype in (np.int8, np.int16, np.int32, np.int64)
+            if len(categories) < np.iinfo(dtype).max
+        )
+        # Code -1 (missing) picks the -1 appended last
+        recoded = np.append(categories.get_indexer(values.cat.categories), -1)
+        return recoded[values.cat.codes.to_numpy()].astype(dtype)
+
+    def extended(self, rows: pd.DataFrame) -> 'OrderColumns':
+        '''
+        Columns w/ rows (parsed by parse_orders) appended, in place.
+
+        Frames from earlier frame() calls only view their own rows, so
+        they're unaffected. Only the newest OrderColumns can be extended.
+        '''
+        extended = copy.copy(self)
+        extended.n_rows = self.n_rows + len(rows)
+        extended._buffers = dict(self._buffers)
+        extended._categories = dict(self._categories)
+
+        for column, buffer in self._buffers.items():
+            if column in self._categories:
+                values = extended._codes(column, rows[column])
+            else:
+                values = rows[column].to_numpy()
+
+            # Double when full, or widen for e.g. a NaN in int columns
+            dtype = np.result_type(buffer.dtype, values.dtype)
+            if len(buffer) < extended.n_rows or dtype != buffer.dtype:
+                grown = np.empty(
+                    max(extended.n_rows, 2 * len(buffer)), dtype=dtype
+                )
+                grown[:self.n_rows] = buffer[:self.n_rows]
+                # A view stays writeable when the registry freezes the
+                # memory behind frame(), see registry.freeze()
+                buffer = extended._buffers[column] = grown[:]
+            buffer[self.n_rows:extended.n_rows] = values
+
+        return extended
+
+    def frame(self) -> pd.DataFrame:
+        '''The orders so far, as read-only views of the buffers.'''
+        columns = {}
+        for column, buffer in self._buffers.items():
+            values = buffer[:self.n_rows]
+            values.flags.writeable = False
+            if column in self._categories:
+                values = pd.Categorical.from_codes(
+                    values, self._categories[column], validate=False
+                )
+            columns[column] = values
+        return pd.DataFrame(columns, copy=False)
+
+
+class ScannedOrders:
+    '''
+    Polars scan of the order table, for the 'polars' engine.
+
+    The file the orders were loaded from is scanned (so filters are
+    pushed down into the read), & the rows appended since are kept in
+    memory next to it, rather than parsing data.csv again once appends
+    have changed its Parquet cache key.
+    '''
+
+    def __init__(self, data: pd.DataFrame, path: Path | str | None = None):
+        import polars as pl
+
+        # Attached Arrow file, else the Parquet cache written on load if
+        # it holds data (not e.g. orders overridden for a benchmark)
+        cached = cache_path()
+        if path is not None:
+            self._scan = pl.scan_ipc(path, memory_map=True)
+        elif (
+            cached.exists()
+            and pq.read_metadata(cached).num_rows == len(data)
+        ):
+            self._scan = pl.scan_parquet(cached)
+        else:  # e.g. 1st scanned once orders were appended
+            self._scan = pl.from_pandas(data).lazy()
+        self._appended = None  # pl.DataFrame
+
+    @property
+    def nbytes(self) -> int:
+        if self._appended is None:
+            return 0
+        return int(self._appended.estimated_size())
+
+    def extended(self, rows: pd.DataFrame) -> 'ScannedOrders':
+        '''Scan w/ rows (parsed by parse_orders) appended in memory.'''
+        import polars as pl
+
+        extended = copy.copy(self)
+        rows = pl.from_pandas(rows)
+        if self._appended is not None:
+            # Chunks are only linked, not copied into one
+            rows = pl.concat([self._appended, rows], how='vertical_relaxed')
+        extended._appended = rows
+        return extended
+
+    def lazy(self):
+        '''LazyFrame of all the orders, nothing is read yet.'''
+        import polars as pl
+
+        if self._appended is None:
+            return self._scan
+        return pl.concat(
+            [self._scan, self._appended.lazy()], how='vertical_relaxed'
+        )
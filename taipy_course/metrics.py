@@ -0,0 +1,279 @@
+'''
+Per-callback metrics for the taipy_course apps, in Prometheus format.
+
+Callbacks decorated with @instrumented record their latency (as a
+histogram), call count and the sessions calling them recently. The
+engines add the rows they scan, push() the bytes it sends, & workers
+the latency of off-thread work until its result is shown. Set
+$TAIPY_COURSE_METRICS to export them, from the first callback on:
+
+- a port number, e.g. 9100, serves them at http://127.0.0.1:9100/metrics
+- anything else is a file path, appended a snapshot every minute and
+  rotated at 10 MiB
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import functools
+import http.server
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import typing as t
+from collections import Counter, OrderedDict, defaultdict
+
+from taipy.gui import get_state_id
+
+
+# +---------+
+# | Metrics |
+# +---------+
+
+# Upper bounds of the latency buckets, in seconds (Prometheus' defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+SESSION_TTL = 30 * 60  # Seconds w/o a call before a session is forgotten
+MAX_SESSIONS = 10_000  # Sessions remembered per callback, least recent out
+
+
+class Metrics:
+    '''Thread-safe counters & histograms, rendered as Prometheus text.'''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets: dict[str, list[int]] = defaultdict(
+            lambda: [0] * len(BUCKETS)
+        )
+        self.seconds: Counter[str] = Counter()  # Total latency
+        self.calls: Counter[str] = Counter()
+        # Per callback: session -> [calls, last call], least recent 1st
+        self.sessions: dict[str, OrderedDict[str, list]] = defaultdict(
+            OrderedDict
+        )
+        self.rows: Counter[str] = Counter()  # Per engine
+        self.payload: Counter[str] = Counter()  # Per bound variable
+
+    def observe(self, callback: str, seconds: float, session: str | None):
+        '''Record one call of callback, from session if in a Gui.'''
+        with self._lock:
+            for number, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    self.buckets[callback][number] += 1
+            self.seconds[callback] += seconds
+            self.calls[callback] += 1
+            if session is not None:
+                now = time.monotonic()
+                sessions = self.sessions[callback]
+                entry = sessions.setdefault(session, [0, now])
+                entry[0] += 1
+                entry[1] = now
+                sessions.move_to_end(session)
+                self._expire(sessions, now)
+
+    @staticmethod
+    def _expire(sessions: OrderedDict[str, list], now: float):
+        '''Forget the sessions idle for SESSION_TTL, or past MAX_SESSIONS.'''
+        while sessions and (
+            len(sessions) > MAX_SESSIONS
+            or next(iter(sessions.values()))[1] < now - SESSION_TTL
+        ):
+            sessions.popitem(last=False)
+
+    def add_rows(self, engine: str, rows: int):
+        '''Count rows (or cube cells) an engine had to go through.'''
+        with self._lock:
+            self.rows[engine] += rows
+
+    def add_payload(self, variable: str, size: int):
+        '''Count the (estimated) bytes of a value pushed to a session.'''
+        with self._lock:
+            self.payload[variable] += size
+
+    def render(self) -> str:
+        '''All metrics in the Prometheus text exposition format.'''
+        lines = []
+
+        def family(name, kind, help):
+            lines.append(f'# HELP taipy_course_{name} {help}')
+            lines.append(f'# TYPE taipy_course_{name} {kind}')
+
+        with self._lock:
+            family('callback_seconds', 'histogram', 'Callback latency.')
+            for callback, counts in self.buckets.items():
+                label = f'callback="{callback}"'
+                for bound, count in zip(BUCKETS, counts):
+                    lines.append(
+                        f'taipy_course_callback_seconds_bucket'
+                        f'{{{label},le="{bound}"}} {count}'
+                    )
+                lines += [
+                    f'taipy_course_callback_seconds_bucket'
+                    f'{{{label},le="+Inf"}} {self.calls[callback]}',
+                    f'taipy_course_callback_seconds_sum{{{label}}} '
+                    f'{self.seconds[callback]}',
+                    f'taipy_course_callback_seconds_count{{{label}}} '
+                    f'{self.calls[callback]}',
+                ]
+
+            now = time.monotonic()
+            for sessions in self.sessions.values():
+                self._expire(sessions, now)
+            family(
+                'callback_sessions', 'gauge',
+                f'Sessions that called a callback in the last {SESSION_TTL}s.',
+            )
+            for callback, sessions in self.sessions.items():
+                lines.append(
+                    f'taipy_course_callback_sessions'
+                    f'{{callback="{callback}"}} {len(sessions)}'
+                )
+            family(
+                'callback_session_calls_max', 'gauge',
+                'Most calls of a callback by one of those sessions.',
+            )
+            for callback, sessions in self.sessions.items():
+                busiest = max(
+                    (calls for calls, _ in sessions.values()), default=0
+                )
+                lines.append(
+                    f'taipy_course_callback_session_calls_max'
+                    f'{{callback="{callback}"}} {busiest}'
+                )
+
+            family(
+                'rows_scanned_total', 'counter',
+                'Order rows (or cube cells) scanned by the query engines.',
+            )
+            for engine, rows in self.rows.items():
+                lines.append(
+                    f'taipy_course_rows_scanned_total{{engine="{engine}"}} '
+                    f'{rows}'
+                )
+
+            family(
+                'payload_bytes_total', 'counter',
+                'Estimated bytes of bound values pushed to sessions.',
+            )
+            for variable, size in self.payload.items():
+                lines.append(
+                    f'taipy_course_payload_bytes_total'
+                    f'{{variable="{variable}"}} {size}'
+                )
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+def instrumented(callback: t.Callable) -> t.Callable:
+    '''Decorator recording the latency & session of a Gui callback.'''
+    @functools.wraps(callback)  # Taipy reads the wrapped signature
+    def wrapper(state, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return callback(state, *args, **kwargs)
+        finally:
+            metrics.observe(
+                callback.__name__, time.perf_counter() - start, session(state)
+            )
+            export()
+    return wrapper
+
+
+def session(state) -> str | None:
+    '''Identifier of the session behind state, None outside of a Gui.'''
+    try:
+        return get_state_id(state)
+    except AttributeError:  # Stand-in state w/o a Gui behind it
+        return None
+
+
+# +--------+
+# | Export |
+# +--------+
+
+_export_lock = threading.Lock()
+_exported = False
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    '''Serves metrics.render() on GET /metrics.'''
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the console
+
+
+def serve_metrics(port: int, host: str = '127.0.0.1') -> threading.Thread:
+    '''Serve /metrics on a background thread.'''
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, name='metrics', daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def log_metrics(
+        path: str,
+        interval: float = 60.0,
+        max_bytes: int = 10 * 2**20,
+        backups: int = 3,
+) -> threading.Thread:
+    '''Append a snapshot to a size-rotated file every interval seconds.'''
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backups
+    )
+
+    def run():
+        while True:
+            time.sleep(interval)
+            handler.emit(logging.makeLogRecord({
+                'msg': f'# {time.strftime("%Y-%m-%dT%H:%M:%S")}\n'
+                + metrics.render(),
+            }))
+
+    thread = threading.Thread(target=run, name='metrics', daemon=True)
+    thread.start()
+    return thread
+
+
+def export():
+    '''Start the exporter set by $TAIPY_COURSE_METRICS, once.'''
+    # Started lazily: w/ Taipy's reloader, only the process running the
+    # Gui (& so the callbacks) must bind the port
+    global _exported
+    with _export_lock:
+        if _exported:
+            return
+        _exported = True
+
+    target = os.environ.get('TAIPY_COURSE_METRICS')
+    if not target:
+        return
+    # Called from the callbacks: a port in use or a bad path is logged,
+    # not raised into them
+    try:
+        if target.isdigit():
+            serve_metrics(int(target))
+        else:
+            log_metrics(target)
+    except Exception:
+        logging.getLogger(__name__).exception(
+            'Could not export metrics to %s', target
+        )
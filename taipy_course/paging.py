@@ -0,0 +1,168 @@
+'''
+Server-side paging for the order tables of the taipy_course dashboards.
+
+Instead of binding a whole filtered frame to tgb.table, the pages bind a
+single page of it. Sorting goes through argsorts computed once per
+column and reused for every page and session, so turning a page is a
+slice. Column filters binary-search the same presorted index for the
+rows equal to their value, rather than comparing every row.
+
+A table can also list given row positions of a shared frame, e.g. the
+orders matching the dashboard filters: only the rows of the page shown
+are ever copied out of it.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import math
+import threading
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+
+# +--------+
+# | Paging |
+# +--------+
+
+PAGE_SIZE = 100
+
+
+class PagedTable:
+    '''Pages of a frame (or of some of its rows), sorted & filtered.'''
+
+    def __init__(
+            self,
+            data: pd.DataFrame,
+            page_size: int = PAGE_SIZE,
+            on_resize: t.Callable[[], None] | None = None,
+            total_rows: int | None = None,
+            positions: np.ndarray | None = None,
+    ):
+        self.data = data
+        self.positions = positions  # Rows of data listed, else all
+        self.page_size = page_size
+        # Rows matching upstream, when data only holds the first ones
+        self.total_rows = len(self) if total_rows is None else total_rows
+        # Argsort & sorted keys per column, see _index()
+        self._indexes: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.on_resize = on_resize  # Called when an index is added
+
+    def __len__(self) -> int:
+        if self.positions is None:
+            return len(self.data)
+        return len(self.positions)
+
+    def __sizeof__(self) -> int:
+        # The frame itself is shared, w/ the cached filtered_orders() or
+        # the registry's orders
+        positions = 0 if self.positions is None else self.positions.nbytes
+        return object.__sizeof__(self) + positions + sum(
+            order.nbytes + keys.nbytes
+            for order, keys in self._indexes.values()
+        )
+
+    def _keys(self, column: str) -> np.ndarray:
+        '''Sort keys of column: its values, or ranks for categoricals.'''
+        values = self.data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            keys = self._ranks(values)[values.cat.codes.to_numpy()]
+        else:
+            keys = values.to_numpy()
+        return keys if self.positions is None else keys[self.positions]
+
+    @staticmethod
+    def _ranks(values: pd.Series) -> np.ndarray:
+        '''
+        Alphabetical rank of each category of values, then -1 for code
+        -1 (missing): appended orders may add categories out of order.
+        '''
+        ranks = values.cat.categories.argsort().argsort()
+        return np.append(ranks, -1)
+
+    def _index(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        '''Row positions sorted ascending by column & their sorted keys.'''
+        with self._lock:
+            index = self._indexes.get(column)
+            if index is None:
+                keys = self._keys(column)
+                order = np.argsort(keys, kind='stable')
+                index = self._indexes[column] = (order, keys[order])
+                added = True
+            else:
+                added = False
+
+        # e.g. so the result cache re-measures this table
+        if added and self.on_resize is not None:
+            self.on_resize()
+        return index
+
+    def order(self, column: str) -> np.ndarray:
+        '''Row positions sorted ascending by column, computed once.'''
+        return self._index(column)[0]
+
+    def matching(self, column: str, value) -> np.ndarray:
+        '''Positions of the rows where column equals value, ascending.'''
+        order, keys = self._index(column)
+        values = self.data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            code = values.cat.categories.get_indexer([value])[0]
+            if code < 0:
+                return order[:0]  # Not a category, so in no row
+            value = self._ranks(values)[code]
+
+        # Equal keys are contiguous in the index, & in position order
+        start = np.searchsorted(keys, value, side='left')
+        stop = np.searchsorted(keys, value, side='right')
+        return order[start:stop]
+
+    def rows(
+            self,
+            order_by: str | None = None,
+            descending: bool = False,
+            filters: dict[str, object] | None = None,
+    ) -> np.ndarray:
+        '''Positions of the matching rows, in display order.'''
+        if filters:
+            # Only the matching rows are sorted, by the same stable order
+            matches = [
+                self.matching(column, value)
+                for column, value in filters.items()
+            ]
+            rows = np.sort(matches[0])
+            for other in matches[1:]:
+                rows = np.intersect1d(rows, other, assume_unique=True)
+            if order_by:
+                keys = self._keys(order_by)[rows]
+                rows = rows[np.argsort(keys, kind='stable')]
+        elif order_by:
+            rows = self.order(order_by)
+        else:
+            rows = np.arange(len(self))
+
+        return rows[::-1] if descending and order_by else rows
+
+    def page_count(self, rows: np.ndarray) -> int:
+        return max(1, math.ceil(len(rows) / self.page_size))
+
+    def summary(self, rows: np.ndarray) -> str:
+        '''Number of rows listed, & of those left out of data if any.'''
+        if self.total_rows > len(self):
+            return (
+                f'{len(rows):,} rows of the first {len(self):,} '
+                f'(of {self.total_rows:,})'
+            )
+        return f'{len(rows):,} rows'
+
+    def page(self, number: int, rows: np.ndarray) -> pd.DataFrame:
+        '''Page number (from 1) of the given rows, as a small frame.'''
+        number = min(max(1, number), self.page_count(rows))
+        start = (number - 1) * self.page_size
+        rows = rows[start:start + self.page_size]
+        if self.positions is not None:
+            rows = self.positions[rows]
+        return self.data.iloc[rows]
@@ -0,0 +1,119 @@
+'''
+Delta-only pushes of bound values to a Taipy session.
+
+Every assignment to a bound variable of a State resends its whole value
+to the browser (the full figure JSON for a map), even if it is what the
+session already shows. push() remembers a fingerprint of the last value
+sent per session & variable and skips the assignment when a new value
+has the same one, e.g. an unchanged map or table page after Apply.
+
+The pages also run their Gui w/ SERVER_CONFIG, which has engine.io gzip
+the HTTP long-polling responses (before the switch to a websocket, &
+for clients that can't switch). Websocket frames aren't compressed by
+the gevent server Taipy runs, so there, only sending less helps.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from taipy.gui import get_state_id
+
+from taipy_course.cache import sizeof
+from taipy_course.metrics import metrics
+
+
+# +------+
+# | Push |
+# +------+
+
+# For Gui.run(server_config=...): engine.io's compression, made explicit
+SERVER_CONFIG = {
+    'socketio': {'http_compression': True, 'compression_threshold': 1024},
+}
+
+MAX_SENT = 10_000  # Pairs remembered, older ones are merely resent
+
+_lock = threading.Lock()
+# Fingerprint of the last values, in least to most recently pushed order
+_sent: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+
+def fingerprint(value) -> str:
+    '''Digest of a bound value, equal for equal values.'''
+    return _fingerprint(value)[0]
+
+
+def _fingerprint(value) -> tuple[str, int]:
+    '''fingerprint() of a value & its approximate size once sent.'''
+    digest = hashlib.blake2b()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+        if isinstance(value, pd.DataFrame):
+            labels = value.columns.tolist()
+        else:
+            labels = [value.name]
+        digest.update(str(labels).encode())
+        size = sizeof(value)
+    elif hasattr(value, 'to_plotly_json'):  # Plotly figures
+        # Hash the trace arrays as they are, w/o serializing them to JSON
+        size = 0
+        for trace in value.data:
+            for key, item in sorted(trace.to_plotly_json().items()):
+                if isinstance(item, np.ndarray):
+                    hashes = pd.util.hash_array(item.ravel())
+                    data = str(item.dtype).encode() + hashes.tobytes()
+                    size += item.nbytes
+                else:
+                    data = _json(item)
+                    size += len(data)
+                digest.update(key.encode() + data)
+        data = _json(value.layout.to_plotly_json())
+        digest.update(data)
+        size += len(data)
+    else:
+        data = _json(value)
+        digest.update(data)
+        size = len(data)
+    return digest.hexdigest(), size
+
+
+def _json(value) -> bytes:
+    return json.dumps(value, sort_keys=True, default=str).encode()
+
+
+def push(state, **values):
+    '''
+    Assign values to the bound variables of state, but only those that
+    changed since the last push() of the same variable to the session.
+
+    Variables pushed this way must not also be assigned directly, or
+    the remembered fingerprint would be stale.
+    '''
+    try:
+        state_id = get_state_id(state)
+    except AttributeError:  # Stand-in state w/o a Gui behind it
+        state_id = None
+
+    for name, value in values.items():
+        # Sized w/ the bytes hashed anyway, instead of serializing it
+        digest, size = _fingerprint(value)
+        if state_id is not None:
+            key = (state_id, name)
+            with _lock:
+                if _sent.get(key) == digest:
+                    _sent.move_to_end(key)
+                    continue  # The browser already shows this value
+                _sent[key] = digest
+                _sent.move_to_end(key)
+                while len(_sent) > MAX_SENT:  # e.g. of closed sessions
+                    _sent.popitem(last=False)
+        setattr(state, name, value)
+        metrics.add_payload(name, size)
@@ -0,0 +1,189 @@
+'''
+Cached dashboard queries shared by every taipy_course session.
+
+Each query is keyed on the normalized filter tuple returned by
+filter_key(), so sessions choosing the same dates and categories reuse
+one another's results. The cache is dropped whenever the registry
+reloads its datasets.
+
+Set $TAIPY_COURSE_APPROXIMATE (e.g. to 1) for the approximate mode: the
+dashboards first show a top-10 estimated from a stratified sample of the
+engine's orders, w/ 95% error bars, while the exact one is computed.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import os
+import typing as t
+
+import pandas as pd
+
+from taipy_course.cache import ResultCache
+from taipy_course.engines import get_engine
+from taipy_course.facets import labels
+from taipy_course.paging import PagedTable
+from taipy_course.registry import registry
+from taipy_course.sampling import top_states_estimate
+
+if t.TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+# +----------------+
+# | Cache & Engine |
+# +----------------+
+
+results = ResultCache()
+registry.on_reload(results.clear)
+
+engine = get_engine()  # See engines.py, pandas unless overridden
+approximate = bool(os.environ.get('TAIPY_COURSE_APPROXIMATE'))
+
+
+def set_engine(name: str):
+    '''Switch every session over to another query engine.'''
+    global engine
+    engine = get_engine(name)
+    results.clear()
+
+
+FilterKey = tuple[
+    pd.Timestamp | None, pd.Timestamp | None, str | None, str | None
+]
+
+
+def filter_key(
+        start_date=None,
+        end_date=None,
+        category: str | None = None,
+        subcategory: str | None = None,
+) -> FilterKey:
+    '''Normalize dashboard filters into a hashable cache key.'''
+    def day(date):
+        return None if date is None else pd.Timestamp(date).normalize()
+
+    return day(start_date), day(end_date), category, subcategory
+
+
+def state_filters(state) -> FilterKey:
+    '''Filter key for the dates & categories selected in a session.'''
+    return filter_key(
+        state.start_date,
+        state.end_date,
+        state.selected_category,
+        state.selected_subcategory,
+    )
+
+
+# +---------+
+# | Queries |
+# +---------+
+
+def filtered_orders(*filters) -> pd.DataFrame:
+    '''Order rows matching the filters, for the dashboard table.'''
+    key = filter_key(*filters)
+    return results.get(
+        (engine.name, 'orders', key), lambda: engine.filtered_orders(*key)
+    )
+
+
+def orders_table(*filters) -> PagedTable:
+    '''Server-side pages of the matching orders, for tgb.table.'''
+    key = filter_key(*filters)
+    cache_key = (engine.name, 'table', key)
+
+    # Sort indexes are added per column on use, so size it again
+    def on_resize():
+        results.resize(cache_key)
+
+    def table() -> PagedTable:
+        if hasattr(engine, 'order_positions'):
+            # Positions in the shared orders, only a page is ever copied
+            return PagedTable(
+                registry.get('orders'),
+                on_resize=on_resize,
+                positions=engine.order_positions(*key),
+            )
+        data = filtered_orders(*key)
+        return PagedTable(
+            data,
+            on_resize=on_resize,
+            # More orders match than the engine kept, e.g. when streaming
+            total_rows=data.attrs.get('total_rows'),
+        )
+
+    return results.get(cache_key, table)
+
+
+def facet_lov(
+        hierarchy: str, *path, start_date=None, end_date=None
+) -> list[tuple[str, str]]:
+    '''
+    Children of a facet node w/ their order line count & sales between
+    the dates, as (value, label) pairs for tgb.selector, e.g.
+    facet_lov('product', 'Furniture') for its sub-categories.
+    '''
+    start_date, end_date, _, _ = filter_key(start_date, end_date)
+    return results.get(
+        (engine.name, 'lov', hierarchy, path, start_date, end_date),
+        lambda: labels(engine.children(
+            hierarchy, *path, start_date=start_date, end_date=end_date
+        )),
+    )
+
+
+def state_sales(*filters) -> pd.Series:
+    '''Total sales by state for the filters.'''
+    key = filter_key(*filters)
+    return results.get(
+        (engine.name, 'state_sales', key), lambda: engine.state_sales(*key)
+    )
+
+
+def sales_chart_data(*filters) -> pd.DataFrame:
+    '''Top-10 states by sales for the filters, for the bar chart.'''
+    key = filter_key(*filters)
+    return results.get(
+        (engine.name, 'chart_data', key),
+        lambda: engine.top_states(state_sales(*key)),
+    )
+
+
+def sales_chart_estimate(*filters) -> pd.DataFrame | None:
+    '''
+    Estimated top-10 states for the filters, as a State/Sales/Error
+    frame, or None if the exact one is already cached (or the engine's
+    sample isn't drawn yet).
+    '''
+    key = filter_key(*filters)
+    if (engine.name, 'chart_data', key) in results:
+        return None  # Nothing to estimate, the exact answer is ready
+    sample = engine.sample()  # Of the orders the engine itself reads
+    if sample is None:
+        return None
+    return results.get(
+        (engine.name, 'estimate', key),
+        lambda: top_states_estimate(sample.state_sales(*key)),
+    )
+
+
+def sales_trend(*filters, freq: str = 'W') -> pd.DataFrame:
+    '''Sales per day ('D') or week ('W') for the filters, for tgb.chart.'''
+    key = filter_key(*filters)
+    return results.get(
+        (engine.name, 'trend', key, freq),
+        lambda: engine.sales_trend(*key, freq=freq),
+    )
+
+
+def sales_map(*filters) -> 'go.Figure':
+    '''Choropleth of sales by state for the filters.'''
+    # Imported on first use, so apps only load Plotly once they map
+    from taipy_course.chart import generate_map
+
+    key = filter_key(*filters)
+    return results.get(
+        (engine.name, 'map', key), lambda: generate_map(state_sales(*key))
+    )
@@ -0,0 +1,268 @@
+'''
+Process-wide dataset registry for the taipy_course apps.
+
+Each dataset is loaded once, on first use, and every page, callback and
+session gets a read-only view of the same frame instead of its own copy.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import contextlib
+import os
+import threading
+import time
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from taipy_course.bitmap import BitmapIndex
+from taipy_course.cache import sizeof
+from taipy_course.cube import build_cube, extend_cube
+from taipy_course.daily import DailySales
+from taipy_course.facets import FacetIndex
+from taipy_course.loader import (
+    OrderColumns,
+    ScannedOrders,
+    attach_orders,
+    load_orders,
+)
+from taipy_course.sampling import StratifiedSample
+from taipy_course.topk import GROUP_COLUMNS, TopK
+
+
+# +----------+
+# | Registry |
+# +----------+
+
+def freeze(dataset):
+    '''
+    Make the arrays behind a frame or series read-only, so the shallow
+    copies handed out by the registry can't write into shared memory.
+    '''
+    if isinstance(dataset, pd.Series):
+        columns = [dataset]
+    elif isinstance(dataset, pd.DataFrame):
+        columns = [dataset.iloc[:, i] for i in range(dataset.shape[1])]
+    else:
+        return dataset
+
+    for column in columns:
+        values = column.array
+        if isinstance(values, pd.Categorical):
+            values = values.codes
+        values = np.asarray(values)
+
+        # Views of views: the base holds the writeable flag pandas uses
+        while isinstance(values.base, np.ndarray):
+            values = values.base
+        values.flags.writeable = False
+    return dataset
+
+
+class DatasetRegistry:
+    '''Load named datasets once and share them across the process.'''
+
+    def __init__(self):
+        self._loaders: dict[str, t.Callable[[], t.Any]] = {}
+        self._appenders: dict[str, t.Callable[[t.Any, t.Any], t.Any]] = {}
+        self._datasets: dict[str, t.Any] = {}
+        self.load_times: dict[str, float] = {}  # Seconds, last load
+        self._lock = threading.RLock()  # Loaders may call get() themselves
+        self._reload_callbacks: list[t.Callable[[], None]] = []
+
+    def register(
+            self,
+            name: str,
+            loader: t.Callable[[], t.Any],
+            append: t.Callable[[t.Any, t.Any], t.Any] | None = None,
+    ):
+        '''
+        Register a zero-argument loader under name (not run yet).
+
+        append(dataset, rows), if given, returns the dataset updated with
+        newly appended order rows, see DatasetRegistry.append().
+        '''
+        with self._lock:
+            self._loaders[name] = loader
+            if append is not None:
+                self._appenders[name] = append
+            self._datasets.pop(name, None)
+
+    def get(self, name: str):
+        '''Read-only view of the dataset, loading it on first use.'''
+        with self._lock:
+            if name not in self._datasets:
+                loaded = set(self._datasets)
+                start = time.perf_counter()
+                self._datasets[name] = freeze(self._loaders[name]())
+
+                # Not counting datasets the loader had to load first
+                nested = set(self._datasets) - loaded - {name}
+                self.load_times[name] = time.perf_counter() - start - sum(
+                    self.load_times[other] for other in nested
+                )
+            dataset = self._datasets[name]
+
+        if isinstance(dataset, (pd.DataFrame, pd.Series)):
+            return dataset.copy(deep=False)  # Shares memory w/ registry
+        return dataset
+
+    def reload(self):
+        '''Drop every loaded dataset and notify on_reload() callbacks.'''
+        with self._lock:
+            self._datasets.clear()  # Derived datasets rebuild lazily too
+            callbacks = list(self._reload_callbacks)
+        for callback in callbacks:
+            callback()
+
+    def append(self, rows: pd.DataFrame):
+        '''
+        Fold newly appended order rows into every loaded dataset.
+
+        Datasets registered w/o an append function are dropped and
+        rebuilt from the updated orders on next use.
+        '''
+        with self._lock:
+            for name in list(self._datasets):  # In registration order
+                if name in self._appenders:
+                    self._datasets[name] = freeze(self._appenders[name](
+                        self._datasets[name], rows
+                    ))
+                else:
+                    del self._datasets[name]
+            callbacks = list(self._reload_callbacks)
+        for callback in callbacks:
+            callback()
+
+    @contextlib.contextmanager
+    def overridden(self, **loaders: t.Callable[[], t.Any]):
+        '''
+        Within the block, load the named datasets w/ loaders instead,
+        e.g. synthetic orders for benchmarks, and every other dataset
+        from those. Loaders & datasets are restored afterwards.
+        '''
+        with self._lock:
+            saved = (
+                dict(self._loaders), dict(self._appenders), self._datasets
+            )
+            self._loaders.update(loaders)
+            for name in loaders:
+                self._appenders.pop(name, None)
+            self._datasets = {}
+            callbacks = list(self._reload_callbacks)
+        for callback in callbacks:
+            callback()
+
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._loaders, self._appenders, self._datasets = saved
+                callbacks = list(self._reload_callbacks)
+            for callback in callbacks:
+                callback()
+
+    def on_reload(self, callback: t.Callable[[], None]):
+        '''Call callback() whenever the datasets are reloaded/appended.'''
+        with self._lock:
+            self._reload_callbacks.append(callback)
+
+    def loaded(self) -> list[str]:
+        '''Names of the datasets currently held in memory.'''
+        with self._lock:
+            return list(self._datasets)
+
+    def memory_usage(self) -> dict[str, int]:
+        '''Bytes held per loaded dataset, including string contents.'''
+        with self._lock:
+            datasets = dict(self._datasets)
+
+        usage = {}
+        for name, dataset in datasets.items():
+            if isinstance(dataset, (pd.DataFrame, pd.Series)):
+                usage[name] = sizeof(dataset)
+            elif hasattr(dataset, 'nbytes'):  # e.g. the bitmap index
+                usage[name] = int(dataset.nbytes)
+        return usage
+
+
+def load_shared_orders():
+    '''Orders mapped from $TAIPY_COURSE_SHARED if set, else loaded.'''
+    # Set for the worker processes of taipy_course.serve, which all map
+    # the one copy published by the server instead of loading their own
+    shared = os.environ.get('TAIPY_COURSE_SHARED')
+    return attach_orders(shared) if shared else load_orders()
+
+
+registry = DatasetRegistry()
+registry.register(
+    'order_columns',  # Growable storage behind 'orders', for appends
+    lambda: OrderColumns(load_shared_orders()),
+    append=OrderColumns.extended,
+)
+registry.register(
+    'orders',  # Rebuilt after appends, as views of the grown columns
+    lambda: registry.get('order_columns').frame(),
+)
+registry.register(
+    'scanned_orders',  # For the polars engine, w/ appends in memory
+    lambda: ScannedOrders(
+        registry.get('orders'), os.environ.get('TAIPY_COURSE_SHARED')
+    ),
+    append=ScannedOrders.extended,
+)
+registry.register(
+    'sales_cube',
+    lambda: build_cube(registry.get('orders')),
+    append=extend_cube,
+)
+registry.register(
+    'bitmap_index',
+    lambda: BitmapIndex(registry.get('orders')),
+    append=BitmapIndex.extended,
+)
+registry.register(
+    'facet_index',
+    lambda: FacetIndex(registry.get('orders')),
+    append=FacetIndex.extended,
+)
+registry.register(
+    'daily_sales',
+    lambda: DailySales(registry.get('orders')),
+    append=DailySales.extended,
+)
+registry.register(
+    'order_sample',  # Approximate mode, engines over these orders
+    lambda: StratifiedSample(registry.get('orders')),
+    append=StratifiedSample.extended,
+)
+for name, column in GROUP_COLUMNS.items():
+    registry.register(
+        name,
+        lambda column=column: TopK(registry.get('orders'), column),
+        append=TopK.extended,
+    )
+
+
+def get_dataset(name: str = 'orders'):
+    '''Shortcut for registry.get() on the shared registry.'''
+    return registry.get(name)
+
+
+# +------+
+# | Main |
+# +------+
+
+if __name__ == '__main__':
+    get_dataset('sales_cube')  # Loads the orders too
+    get_dataset('bitmap_index')
+    get_dataset('facet_index')
+    get_dataset('daily_sales')
+    get_dataset('order_sample')
+    for name in GROUP_COLUMNS:
+        get_dataset(name)
+    for name, size in registry.memory_usage().items():
+        print(f'{name}: {size / 2**20:,.2f} MiB')
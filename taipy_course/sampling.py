@@ -0,0 +1,386 @@
+'''
+Stratified samples of the order table for approximate dashboard answers.
+
+The orders are split in strata, one per Category x State, and a fixed
+fraction of every stratum (at least a few rows) is drawn once at load.
+The total of a filter is then estimated from the sample alone,
+
+    total = sum over strata of N_h * mean_h(Sales x filter)
+
+with its variance summed per stratum, so a query costs the same however
+large the order history is. Answers come with the half-width of their
+95% confidence interval, drawn as error bars by error_bars().
+
+Appended orders go to a 2nd stratum per Category x State, where each row
+is kept w/ the stratum's rate. The rate only decreases as the stratum
+grows (down to fraction, or min_rows rows in all), the rows kept before
+being kept again w/ the ratio of the new rate to the old, so every row
+of the stratum had the same chance to be kept whatever the appends. The
+sample is thinned back to max_rows when appends take it past. So a sample
+of data larger than RAM is drawn a chunk at a time, see sample_chunks().
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from taipy_course.topk import top_k
+
+
+# +--------+
+# | Sample |
+# +--------+
+
+STRATA_COLUMNS = ['Category', 'State']
+SAMPLE_COLUMNS = [
+    'Order Date', 'Category', 'Sub-Category', 'State', 'Sales'
+]
+Z_95 = 1.959964  # Standard normal quantile for 95% intervals
+
+
+def _draw(codes: np.ndarray, counts: np.ndarray, rng) -> np.ndarray:
+    '''Sorted positions of counts[h] random rows of each stratum h.'''
+    sizes = np.bincount(codes, minlength=len(counts))
+
+    # Shuffle, then keep the first counts[h] rows of each stratum h
+    shuffled = rng.permutation(len(codes))
+    order = shuffled[np.argsort(codes[shuffled], kind='stable')]
+    starts = np.cumsum(sizes) - sizes
+    rank = np.arange(len(codes)) - np.repeat(starts, sizes)
+    return np.sort(order[rank < np.repeat(counts, sizes)])
+
+
+def _cap(counts: np.ndarray, floors: np.ndarray, total: int) -> np.ndarray:
+    '''counts scaled down to sum to at most total, but not below floors.'''
+    spare = counts - floors
+    if counts.sum() <= total or not spare.any():
+        return counts
+    ratio = max(total - floors.sum(), 0) / spare.sum()
+    return floors + np.floor(spare * ratio).astype(int)
+
+
+class StratifiedSample:
+    '''Rows drawn per Category/State stratum, with their stratum sizes.'''
+
+    def __init__(
+            self,
+            data: pd.DataFrame,
+            fraction: float = 0.05,
+            min_rows: int = 30,
+            max_rows: int = 200_000,
+            seed: int = 0,
+    ):
+        keys = pd.MultiIndex.from_frame(data[STRATA_COLUMNS])
+        codes, strata = keys.factorize()
+        sizes = np.bincount(codes, minlength=len(strata))
+
+        # Fewer rows than fraction on huge tables, to bound query time,
+        # & never so many per stratum that the floors alone go past it
+        self.fraction = min(fraction, max_rows / max(len(data), 1))
+        self.min_rows = min(min_rows, max_rows // max(len(strata), 1))
+        self.max_rows = max_rows
+        floors = np.minimum(self.min_rows, sizes)
+        counts = np.clip(
+            np.ceil(sizes * self.fraction).astype(int), floors, sizes
+        )
+        counts = _cap(counts, floors, max_rows)  # Rounded up above
+        drawn = _draw(codes, counts, np.random.default_rng(seed))
+
+        self._build(
+            data[SAMPLE_COLUMNS].iloc[drawn].reset_index(drop=True),
+            codes[drawn],
+            sizes,
+            counts,
+            strata,
+            rates=np.empty(0),
+        )
+
+    def _build(self, rows, strata, sizes, counts, keys, rates):
+        '''Set the sampled rows & stratum arrays, and derived lookups.'''
+        self.rows = rows
+        self.strata = strata  # Stratum of each sampled row
+        self.sizes = sizes  # Orders per stratum
+        self.counts = counts  # Sampled orders per stratum
+        self.keys = keys.set_names(STRATA_COLUMNS)  # Per stratum
+        self.rates = rates  # Per appended stratum, after those drawn
+        self.n_drawn = len(sizes) - len(rates)  # Strata drawn at load
+        self._states, self.states = pd.factorize(
+            self.keys.get_level_values('State').to_numpy(), sort=True
+        )
+        self._dates = rows['Order Date'].to_numpy()
+        self._sales = rows['Sales'].to_numpy(dtype=float)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rows.memory_usage(deep=True).sum())
+
+    def extended(self, rows: pd.DataFrame) -> 'StratifiedSample':
+        '''New sample w/ appended order rows, in the appended strata.'''
+        # Appended strata are kept apart from those drawn at load: merging
+        # them would mix rows drawn w/ different probabilities
+        rng = np.random.default_rng(int(self.sizes.sum()))
+        codes, new_keys = pd.MultiIndex.from_frame(
+            rows[STRATA_COLUMNS]
+        ).factorize()
+        appended = self.keys[self.n_drawn:]
+        appended = appended.append(new_keys[~new_keys.isin(appended)])
+        keys = self.keys[:self.n_drawn].append(appended)
+        codes = self.n_drawn + appended.get_indexer(new_keys)[codes]
+
+        sizes = np.bincount(codes, minlength=len(keys))
+        sizes[:len(self.sizes)] += self.sizes
+        old_rates = np.r_[self.rates, np.ones(len(keys) - len(self.sizes))]
+        rates = np.minimum(
+            old_rates,
+            np.maximum(
+                self.fraction,
+                self.min_rows / sizes[self.n_drawn:].clip(min=1),
+            ),
+        ).clip(max=1)
+
+        # Rows kept w/ the new rate overall: old ones w/ the ratio of rates
+        keep = np.ones(len(self.rows), dtype=bool)
+        old = self.strata >= self.n_drawn
+        ratio = rates / old_rates
+        keep[old] = rng.random(old.sum()) < ratio[
+            self.strata[old] - self.n_drawn
+        ]
+        added = rng.random(len(rows)) < rates[codes - self.n_drawn]
+
+        extended = StratifiedSample.__new__(StratifiedSample)
+        extended.fraction, extended.min_rows = self.fraction, self.min_rows
+        extended.max_rows = self.max_rows
+        strata = np.concatenate([self.strata[keep], codes[added]])
+        extended._build(
+            pd.concat(
+                [self.rows[keep], rows[SAMPLE_COLUMNS][added]],
+                ignore_index=True,
+            ),
+            strata,
+            sizes,
+            np.bincount(strata, minlength=len(keys)),
+            keys,
+            rates,
+        )
+        while len(extended.rows) > extended.max_rows:
+            extended._thin(rng)
+        return extended
+
+    def _thin(self, rng):
+        '''Drop rows of every stratum, down to about max_rows in all.'''
+        # Strata drawn at load keep their min_rows floors, the others none
+        drawn = self.counts[:self.n_drawn]
+        floors = np.minimum(self.min_rows, drawn)
+        spare = len(self.rows) - floors.sum()
+        ratio = max(self.max_rows - floors.sum(), 0) / spare
+        counts = floors + np.floor((drawn - floors) * ratio).astype(int)
+
+        keep = np.zeros(len(self.rows), dtype=bool)
+        at_load = self.strata < self.n_drawn
+        keep[np.flatnonzero(at_load)[
+            _draw(self.strata[at_load], counts, rng)
+        ]] = True
+        keep[~at_load] = rng.random((~at_load).sum()) < ratio
+
+        self.fraction *= ratio  # & so the rate of later appends
+        strata = self.strata[keep]
+        self._build(
+            self.rows[keep].reset_index(drop=True),
+            strata,
+            self.sizes,
+            np.bincount(strata, minlength=len(self.sizes)),
+            self.keys,
+            self.rates * ratio,
+        )
+
+    def _match(self, start_date, end_date, category, subcategory):
+        '''Mask of the sampled rows matching the dashboard filters.'''
+        mask = np.ones(len(self.rows), dtype=bool)
+        if start_date is not None:
+            mask &= self._dates >= pd.Timestamp(start_date).to_datetime64()
+        if end_date is not None:
+            mask &= self._dates <= pd.Timestamp(end_date).to_datetime64()
+        if category is not None:
+            mask &= (self.rows['Category'] == category).to_numpy()
+        if subcategory is not None:
+            mask &= (self.rows['Sub-Category'] == subcategory).to_numpy()
+        return mask
+
+    def state_sales(
+            self,
+            start_date=None,
+            end_date=None,
+            category: str | None = None,
+            subcategory: str | None = None,
+    ) -> pd.DataFrame:
+        '''
+        Estimated total sales by state for the filters, w/ the half-width
+        of their 95% confidence interval, as Sales & Error columns.
+
+        States w/o any sampled order matching are left out.
+        '''
+        mask = self._match(start_date, end_date, category, subcategory)
+        sales = np.where(mask, self._sales, 0.0)
+        n_strata = len(self.sizes)
+
+        # Mean & sample variance of Sales x filter within each stratum
+        # (an appended stratum may have no row kept, & so no estimate)
+        n = self.counts
+        mean = np.divide(
+            np.bincount(self.strata, sales, minlength=n_strata), n,
+            out=np.zeros(n_strata), where=n > 0,
+        )
+        squares = np.bincount(self.strata, sales ** 2, minlength=n_strata)
+        variance = np.divide(
+            squares - n * mean ** 2, n - 1,
+            out=np.zeros(n_strata), where=n > 1,
+        ).clip(min=0)
+
+        # Stratum totals & their variances, w/ finite population correction
+        totals = self.sizes * mean
+        variances = np.divide(
+            self.sizes ** 2 * (1 - n / self.sizes) * variance, n,
+            out=np.zeros(n_strata), where=n > 0,
+        )
+        matched = np.bincount(self.strata, mask, minlength=n_strata)
+
+        n_states = len(self.states)
+        by_state = np.bincount(self._states, totals, minlength=n_states)
+        spread = np.bincount(self._states, variances, minlength=n_states)
+        found = np.bincount(self._states, matched, minlength=n_states) > 0
+        return pd.DataFrame(
+            {
+                'Sales': by_state[found],
+                'Error': Z_95 * np.sqrt(spread[found]),
+            },
+            index=pd.Index(self.states[found], name='State'),
+        )
+
+
+def sample_chunks(
+        chunks: t.Iterable[pd.DataFrame], **options
+) -> StratifiedSample | None:
+    '''
+    Sample of orders read a chunk at a time (see loader.read_chunks()),
+    never all in memory: the 1st chunk is drawn, the others appended.
+    None if there are no orders.
+    '''
+    sample = None
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        if sample is None:
+            sample = StratifiedSample(chunk, **options)
+        else:
+            sample = sample.extended(chunk)
+    return sample
+
+
+def top_states_estimate(
+        estimate: pd.DataFrame, n: int = 10
+) -> pd.DataFrame:
+    '''Top-n states by estimated sales, as a State/Sales/Error frame.'''
+    top = top_k(estimate['Sales'], n)
+    return estimate.loc[top.index].reset_index()
+
+
+def error_bars(
+        estimate: pd.DataFrame, color: str = '#444', cap: float = 0.15
+) -> list[dict]:
+    '''
+    Layout shapes drawing estimate's Error around its Sales as error
+    bars, one per row in bar order (tgb.chart's dynamic layout can hold
+    shapes, while its traces can't take error arrays).
+    '''
+    shapes = []
+    line = {'color': color, 'width': 1.5}
+    for position, (sales, error) in enumerate(
+            zip(estimate['Sales'], estimate['Error'])
+    ):
+        low, high = sales - error, sales + error
+        shapes += [
+            # Category axes place bar i at x = i
+            dict(type='line', x0=position, x1=position, y0=low, y1=high),
+            dict(type='line', x0=position - cap, x1=position + cap,
+                 y0=low, y1=low),
+            dict(type='line', x0=position - cap, x1=position + cap,
+                 y0=high, y1=high),
+        ]
+    return [
+        dict(shape, xref='x', yref='y', line=line) for shape in shapes
+    ]
+
+
+# +------+
+# | Main |
+# +------+
+
+if __name__ == '__main__':
+    import time
+
+    from taipy_course.benchmark import synthetic_orders
+
+    # Self-check: how often the top-10's intervals cover exact totals
+    data = synthetic_orders(1_000_000)
+    start = time.perf_counter()
+    sample = StratifiedSample(data)
+    print(
+        f'{len(data):,} orders -> {len(sample.rows):,} sampled in '
+        f'{len(sample.sizes)} strata, {time.perf_counter() - start:.2f} s'
+    )
+    for filters in [
+        (None, None, None, None),
+        (pd.Timestamp('2017-01-01'), pd.Timestamp('2017-12-31'),
+         'Technology', 'Phones'),
+        (pd.Timestamp('2016-03-15'), pd.Timestamp('2016-09-10'),
+         'Furniture', None),
+    ]:
+        start = time.perf_counter()
+        estimate = sample.state_sales(*filters)
+        elapsed = time.perf_counter() - start
+
+        start_date, end_date, category, subcategory = filters
+        rows = data
+        if start_date is not None:
+            rows = rows[rows['Order Date'].between(start_date, end_date)]
+        if category is not None:
+            rows = rows[rows['Category'] == category]
+        if subcategory is not None:
+            rows = rows[rows['Sub-Category'] == subcategory]
+        exact = rows.groupby('State', observed=True)['Sales'].sum()
+        top = top_states_estimate(estimate)
+        exact = exact.rename(index=str).reindex(top['State'].astype(str))
+
+        covered = (
+            (exact.to_numpy() - top['Sales']).abs() <= top['Error']
+        ).mean()
+        relative = (top['Error'] / top['Sales']).median()
+        print(
+            f'{filters[2]} - {filters[3]}: {elapsed * 1000:.1f} ms, top-10 '
+            f'median error ±{relative:.1%}, {covered:.0%} covered'
+        )
+
+    # Appends: bounded rows & strata, intervals still covering the totals
+    half = len(data) // 2
+    appended = StratifiedSample(data.iloc[:half], max_rows=30_000)
+    start = time.perf_counter()
+    for chunk in np.array_split(np.arange(half, len(data)), 20):
+        appended = appended.extended(data.iloc[chunk])
+    elapsed = time.perf_counter() - start
+    assert len(appended.rows) <= 30_000 and appended.sizes.sum() == len(data)
+    assert len(appended.sizes) <= 2 * len(sample.sizes)
+    estimate = appended.state_sales()
+    exact = data.groupby('State', observed=True)['Sales'].sum()
+    exact = exact.rename(index=str).reindex(estimate.index.astype(str))
+    covered = (
+        (exact.to_numpy() - estimate['Sales']).abs() <= estimate['Error']
+    ).mean()
+    print(
+        f'20 appends in {elapsed:.2f} s -> {len(appended.rows):,} sampled '
+        f'in {len(appended.sizes)} strata, {covered:.0%} of states covered'
+    )
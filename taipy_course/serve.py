@@ -0,0 +1,153 @@
+'''
+Multi-process serving of a taipy_course app over one shared dataset.
+
+    python -m taipy_course.serve --workers 4 --port 5000
+
+The orders are loaded once and published as an Arrow file (see
+loader.publish_orders()) that every worker maps read-only, so adding
+workers adds cores but not copies of the data. Each worker is a Gui
+process of its own on a private port. A small TCP balancer on --port
+spreads clients over them, always sending a client (by IP) to the same
+worker since a session's state only lives in one process.
+
+Only the server tails data.csv: it publishes the orders appended as
+batch files next to the shared one, & the workers append them in turn
+(see ingest.py), so they all serve the same orders. With
+$TAIPY_COURSE_METRICS set, each worker exports its metrics on the next
+port (or to a file) of its own.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+
+from taipy_course.ingest import OrderTail
+from taipy_course.loader import SHARED_PATH
+
+
+# +---------+
+# | Workers |
+# +---------+
+
+def worker_metrics(target: str, number: int) -> str:
+    '''$TAIPY_COURSE_METRICS for a worker: its own port or file.'''
+    if not target:
+        return target
+    if target.isdigit():
+        return str(int(target) + number)
+    path = Path(target)
+    return str(path.with_name(f'{path.stem}-{number}{path.suffix}'))
+
+
+def start_workers(
+        page: str, ports: list[int], shared=SHARED_PATH
+) -> list[subprocess.Popen]:
+    '''Run the page module once per port, mapping the shared orders.'''
+    env = {**os.environ, 'TAIPY_COURSE_SHARED': str(shared)}
+    metrics = os.environ.get('TAIPY_COURSE_METRICS', '')
+    return [
+        subprocess.Popen(
+            [
+                sys.executable, '-m', page,
+                '--port', str(port),
+                '--no-reloader',  # The reloader would fork a 2nd process
+                '--no-run-browser',
+            ],
+            env={**env, 'TAIPY_COURSE_METRICS': worker_metrics(metrics, n)},
+        )
+        for n, port in enumerate(ports)
+    ]
+
+
+# +----------+
+# | Balancer |
+# +----------+
+
+def pick_worker(client: str, ports: list[int]) -> int:
+    '''Index of the worker for a client IP, the same on every call.'''
+    return zlib.crc32(client.encode()) % len(ports)  # Not salted as hash()
+
+
+async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    '''Copy bytes from reader to writer until either side closes.'''
+    try:
+        while data := await reader.read(2**16):
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def proxy(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        ports: list[int],
+):
+    '''Forward a client connection to its worker, in both directions.'''
+    client = writer.get_extra_info('peername')[0]
+    first = pick_worker(client, ports)
+
+    # Fall over to the next worker while the client's one is down
+    for offset in range(len(ports)):
+        port = ports[(first + offset) % len(ports)]
+        try:
+            upstream = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            continue
+        break
+    else:
+        writer.close()
+        return
+
+    upstream_reader, upstream_writer = upstream
+    await asyncio.gather(
+        pipe(reader, upstream_writer),
+        pipe(upstream_reader, writer),
+    )
+
+
+async def balance(host: str, port: int, ports: list[int]):
+    '''Serve the balancer on host:port until cancelled.'''
+    server = await asyncio.start_server(
+        lambda reader, writer: proxy(reader, writer, ports), host, port
+    )
+    async with server:
+        await server.serve_forever()
+
+
+# +------+
+# | Main |
+# +------+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--page', default='taipy_course.5_multipage')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    # Publish before any worker starts mapping the file, then a batch on
+    # every append to data.csv, tailed here rather than by each worker
+    OrderTail().publish(SHARED_PATH)
+
+    ports = [args.port + 1 + number for number in range(args.workers)]
+    workers = start_workers(args.page, ports)
+    print(f'{args.workers} workers behind http://{args.host}:{args.port}')
+    try:
+        asyncio.run(balance(args.host, args.port, ports))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            worker.terminate()
@@ -0,0 +1,124 @@
+'''
+Startup profile of a taipy_course app, up to its first page.
+
+    python -m taipy_course.startup taipy_course.5_multipage
+
+Imports the page module in a fresh interpreter under -X importtime (the
+Gui isn't run) and reports the slowest imports, then runs its on_init()
+for a first session, which the apps defer the loading of the orders to.
+It reports how long that takes, the time spent loading each dataset,
+and how long the first map takes (already built by some on_init()).
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+# +---------+
+# | Profile |
+# +---------+
+
+# Run in the fresh interpreter, prints its timings as JSON on stdout
+MARKER = '-- page imported --'
+PROBE = f'''
+MARKER = {MARKER!r}
+import importlib, json, sys, time
+
+start = time.perf_counter()
+page = importlib.import_module(sys.argv[1])
+imported = time.perf_counter() - start
+print(MARKER, file=sys.stderr)  # Later imports belong to the 1st session
+
+from taipy_course.benchmark import stand_in_state
+from taipy_course.queries import sales_map
+from taipy_course.registry import registry
+
+start = time.perf_counter()
+if hasattr(page, 'on_init'):
+    page.on_init(stand_in_state(page))
+first_session = time.perf_counter() - start
+
+start = time.perf_counter()
+sales_map()
+first_map = time.perf_counter() - start
+
+print(json.dumps({{
+    'import': imported,
+    'first_session': first_session,
+    'datasets': registry.load_times,
+    'first_map': first_map,
+}}))
+'''
+
+
+def import_times(log: str) -> dict[str, float]:
+    '''Cumulative seconds per top-level package from -X importtime.'''
+    times = {}
+    for line in log.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        package = module.strip().split('.')[0]
+
+        # The package's own entry includes every submodule it imports
+        times[package] = max(times.get(package, 0), int(cumulative) / 1e6)
+    return times
+
+
+def profile(page: str) -> dict:
+    '''Import times, dataset load times & first map time of a page.'''
+    run = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE, page],
+        capture_output=True,
+        text=True,
+        env={
+            **os.environ,
+            # Importable from here, ahead of (not instead of) the caller's
+            'PYTHONPATH': os.pathsep.join(filter(None, [
+                os.getcwd(), os.environ.get('PYTHONPATH')
+            ])),
+        },
+    )
+    if run.returncode:
+        raise RuntimeError(f'Importing {page} failed:\n{run.stderr}')
+
+    timings = json.loads(run.stdout.splitlines()[-1])
+    timings['imports'] = import_times(run.stderr.split(MARKER)[0])
+    return timings
+
+
+# +------+
+# | Main |
+# +------+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('page', nargs='?', default='taipy_course.5_multipage')
+    parser.add_argument(
+        '--top', type=int, default=10,
+        help='number of slowest top-level imports to list',
+    )
+    args = parser.parse_args()
+
+    timings = profile(args.page)
+    print(f"Import of {args.page}: {timings['import'] * 1000:,.0f} ms")
+    slowest = sorted(
+        timings['imports'].items(), key=lambda item: item[1], reverse=True
+    )
+    for package, seconds in slowest[:args.top]:
+        print(f'  {package:<24} {seconds * 1000:>8,.0f} ms')
+    print(
+        f"First session (on_init): "
+        f"{timings['first_session'] * 1000:,.0f} ms"
+    )
+    print('Dataset loads (mostly in the 1st session):')
+    for name, seconds in timings['datasets'].items():
+        print(f'  {name:<24} {seconds * 1000:>8,.0f} ms')
+    print(f"First map: {timings['first_map'] * 1000:,.0f} ms")
@@ -0,0 +1,119 @@
+'''
+Paged order table shared by the taipy_course dashboards.
+
+A page imports the state variables & callbacks below (Taipy binds them
+by name in the page's module) and calls table_controls() where the
+table goes. Its sessions must hold the applied_filters the table lists
+orders for, & call refresh_table() when those change, starting w/ their
+on_init(): nothing is loaded when the page module is imported.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import taipy.gui.builder as tgb
+
+from taipy_course.loader import CATEGORY_COLUMNS, DATA_PATH, read_chunks
+from taipy_course.paging import PAGE_SIZE
+from taipy_course.push import push
+from taipy_course.queries import orders_table
+
+
+# +---------+
+# | Backend |
+# +---------+
+
+# Server-side paged order table: only the visible page is ever bound.
+# Typed but empty until refresh_table(), so pages render its columns
+# from the 1st lines of data.csv rather than the loaded orders
+table_data = next(read_chunks(DATA_PATH, PAGE_SIZE)).iloc[:0]
+table_columns = table_data.columns.tolist()
+filter_columns = CATEGORY_COLUMNS  # Text columns, filtered on equality
+table_sort = 'Order Date'
+table_order = 'Ascending'
+table_filter_column = 'City'
+table_filter_value = ''
+table_page = 1
+table_page_count = 1
+table_summary = ''
+
+
+def refresh_table(state):
+    # Sorted & filtered server-side, then sliced to the current page
+    table = orders_table(*state.applied_filters)
+    rows = table.rows(
+        order_by=state.table_sort,
+        descending=state.table_order == 'Descending',
+        filters=(
+            {state.table_filter_column: state.table_filter_value}
+            if state.table_filter_value else None
+        ),
+    )
+    page_count = table.page_count(rows)
+    state.table_page = min(max(1, state.table_page), page_count)
+    push(
+        state,
+        table_page_count=page_count,
+        table_summary=table.summary(rows),
+        table_data=table.page(state.table_page, rows),
+    )
+
+
+def change_table_view(state):
+    state.table_page = 1  # New sort or filter, so back to the 1st page
+    refresh_table(state)
+
+
+def previous_table_page(state):
+    state.table_page -= 1
+    refresh_table(state)
+
+
+def next_table_page(state):
+    state.table_page += 1
+    refresh_table(state)
+
+
+# +----------+
+# | Elements |
+# +----------+
+
+def table_controls():
+    '''Sort, filter & paging controls, then the current table page.'''
+    with tgb.layout(columns='1 1 1 1 1'):
+        tgb.selector(
+            value='{table_sort}',
+            lov=table_columns,
+            dropdown=True,
+            label='Sort by',
+            on_change=change_table_view
+        )
+        tgb.selector(
+            value='{table_order}',
+            lov=['Ascending', 'Descending'],
+            dropdown=True,
+            label='Order',
+            on_change=change_table_view
+        )
+        tgb.selector(
+            value='{table_filter_column}',
+            lov=filter_columns,
+            dropdown=True,
+            label='Filter on',
+            on_change=change_table_view
+        )
+        tgb.input(
+            value='{table_filter_value}',
+            label='Equal to',
+            on_change=change_table_view
+        )
+
+        with tgb.part(class_name='text-center'):
+            tgb.button('<', on_action=previous_table_page)
+            tgb.text('Page {table_page} of {table_page_count}')
+            tgb.button('>', on_action=next_table_page)
+            tgb.text('{table_summary}')
+
+    # Current page of source data by selected category
+    tgb.table(data='{table_data}', page_size=PAGE_SIZE, sortable=False)
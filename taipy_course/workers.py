@@ -0,0 +1,106 @@
+'''
+Off-thread execution of dashboard callbacks.
+
+A callback reads what it needs from its State, then hands the slow part
+to submit(). The work runs on a shared thread pool and its result is
+pushed back to the session once ready, so the Gui event handler returns
+straight away. A newer request on the same session & channel supersedes
+older ones: those not started yet are cancelled, and the results of
+those already running are dropped.
+
+Each request's round trip, from submit() until apply() has shown its
+result, is recorded in metrics as the callback '<channel>.round_trip':
+an @instrumented callback calling submit() only times the dispatch.
+'''
+
+# +---------+
+# | Imports |
+# +---------+
+
+import itertools
+import os
+import threading
+import time
+import traceback
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from taipy.gui import get_state_id, invoke_callback
+
+from taipy_course.metrics import metrics
+
+
+# +------+
+# | Pool |
+# +------+
+
+executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) + 4),
+    thread_name_prefix='dashboard',
+)
+
+_lock = threading.Lock()
+_requests = itertools.count(1)  # Request numbers, unique across sessions
+_latest: dict[tuple[str, str], int] = {}  # Newest request per channel
+_pending: dict[tuple[str, str], Future] = {}
+
+
+def submit(
+        state,
+        compute: t.Callable[[], t.Any],
+        apply: t.Callable[[t.Any, t.Any], None],
+        channel: str = 'default',
+):
+    '''
+    Run compute() off-thread, then apply(state, result) for the session.
+
+    compute() must not touch state (it isn't thread-safe), so read the
+    filters & co. from state before calling submit(). Outside of a Gui
+    (e.g. in the benchmarks) everything runs inline.
+    '''
+    started = time.perf_counter()
+    try:
+        gui = state.get_gui()
+    except AttributeError:  # Stand-in state w/o a Gui behind it
+        apply(state, compute())
+        _round_trip(channel, started, None)
+        return
+
+    key = (get_state_id(state), channel)
+
+    def timed_apply(state, result):
+        try:
+            apply(state, result)
+        finally:
+            _round_trip(channel, started, key[0])
+    with _lock:
+        generation = next(_requests)
+        _latest[key] = generation
+        superseded = _pending.pop(key, None)
+        future = executor.submit(compute)
+        _pending[key] = future
+    if superseded is not None:
+        # Only succeeds if it hasn't started yet. Its done() runs right
+        # away then, & takes the lock, so outside of it
+        superseded.cancel()
+
+    def done(future: Future):
+        with _lock:
+            if _latest.get(key) != generation:
+                return  # A newer request came in, nobody wants this one
+            # Newest is done, so forget the channel until its next request
+            del _latest[key], _pending[key]
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            traceback.print_exception(future.exception())
+            return
+        invoke_callback(gui, key[0], timed_apply, [future.result()])
+
+    future.add_done_callback(done)
+
+
+def _round_trip(channel: str, started: float, session: str | None):
+    metrics.observe(
+        f'{channel}.round_trip', time.perf_counter() - started, session
+    )